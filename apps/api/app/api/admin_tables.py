@@ -5,11 +5,13 @@ Backend endpoints for table management (QR codes, token rotation, etc.)
 SECURITY: These endpoints require admin/manager authentication
 """
 
+import json
 import uuid
 from datetime import datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
@@ -17,6 +19,7 @@ from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.models import User, UserRole
 from app.services.table_service import TableService, get_table_service
+from app.services import table_cache
 
 
 
@@ -127,25 +130,37 @@ async def list_tables_with_qr(
     """
     List all tables with QR code generation info.
     Used by the admin QR code management page.
+    
+    The body is streamed row by row (same shape as TableListResponse);
+    each row is validated against TableQRInfo as it is written.
     """
     service = get_table_service(db)
-    tables = await service.get_all_tables_with_qr_info(user.tenant_id)
     
     # Build base URL for QR codes
     from app.core.config import get_settings
     settings = get_settings()
     base_url = f"{settings.frontend_url}/dine"
+    qr_prefix = f"{base_url}/{user.tenant_id}/"
     
-    return TableListResponse(
-        tables=[
-            TableQRInfo(
-                **t,
-                qr_url=f"{base_url}/{user.tenant_id}/{t['id']}?token={t['qr_secret_token']}"
-            )
-            for t in tables
-        ],
-        base_url=base_url
-    )
+    def encode(t: dict) -> str:
+        t["qr_url"] = f"{qr_prefix}{t['id']}?token={t['qr_secret_token']}"
+        return TableQRInfo(**t).model_dump_json()
+    
+    # Run the query and encode the first row before committing to a 200,
+    # so connection/query errors still surface as a normal error response
+    rows = service.get_all_tables_with_qr_info(user.tenant_id)
+    first = await anext(rows, None)
+    first_json = encode(first) if first is not None else None
+    
+    async def body():
+        yield '{"tables":['
+        if first_json is not None:
+            yield first_json
+            async for t in rows:
+                yield "," + encode(t)
+        yield '],"base_url":' + json.dumps(base_url) + '}'
+    
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @router.post("/{table_id}/rotate-token", response_model=RotateTokenResponse)
@@ -370,6 +385,7 @@ async def create_table(
     db.add(table)
     await db.commit()
     await db.refresh(table)
+    table_cache.invalidate(user.tenant_id)
     
     return TableResponse(
         id=str(table.id),
@@ -444,6 +460,7 @@ async def update_table(
     
     await db.commit()
     await db.refresh(table)
+    table_cache.invalidate(user.tenant_id)
     
     return TableResponse(
         id=str(table.id),
@@ -514,6 +531,7 @@ async def delete_table(
     table_number = table.number
     await db.delete(table)
     await db.commit()
+    table_cache.invalidate(user.tenant_id)
     
     return {
         "message": f"Table {table_number} deleted successfully",
@@ -578,6 +596,7 @@ async def set_table_count(
             tables_created += 1
         
         await db.commit()
+        table_cache.invalidate(user.tenant_id)
     
     elif target < current_count:
         # Remove tables (highest numbers first, only free ones)
@@ -613,6 +632,7 @@ async def set_table_count(
             tables_deleted += 1
         
         await db.commit()
+        table_cache.invalidate(user.tenant_id)
     
     # Get final count
     final_result = await db.execute(
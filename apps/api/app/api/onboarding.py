@@ -485,6 +485,7 @@ async def _create_tables_for_tenant(db: AsyncSession, tenant_id, table_count: in
     """
     import uuid
     from app.models.models import Table, TableStatus
+    from app.services import table_cache
     
     # Clamp table count to reasonable limits
     table_count = max(1, min(50, table_count))
@@ -509,6 +510,7 @@ async def _create_tables_for_tenant(db: AsyncSession, tenant_id, table_count: in
         db.add(table)
     
     await db.commit()
+    table_cache.invalidate(tenant_id)
     return table_count
 
 
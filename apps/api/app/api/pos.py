@@ -15,6 +15,7 @@ from sqlalchemy.orm import selectinload
 from app.core.database import get_db
 from app.core.security import get_current_user, require_waiter, require_cashier, require_onboarding_complete
 from app.core.websocket_manager import ws_manager
+from app.services import table_cache
 from app.models.models import (
     User, Order, OrderItem, MenuItem, Table, BillSplit,
     OrderStatus, OrderItemStatus, TableStatus, SplitType
@@ -642,6 +643,7 @@ async def create_cafeteria_order(
         )
     )
     counter_table = counter_table_result.scalar_one_or_none()
+    created_counter_table = counter_table is None
     
     if not counter_table:
         # Create counter table if it doesn't exist
@@ -737,6 +739,8 @@ async def create_cafeteria_order(
     
     await db.commit()
     await db.refresh(order)
+    if created_counter_table:
+        table_cache.invalidate(current_user.tenant_id)
     
     # Send to kitchen via WebSocket (include both camelCase and snake_case for frontend compatibility)
     if kitchen_items:
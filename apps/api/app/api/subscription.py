@@ -19,6 +19,7 @@ Author: RestoNext Team
 """
 
 import os
+import time
 import logging
 from datetime import datetime
 from typing import Optional
@@ -580,7 +581,7 @@ async def _handle_payment_failed(invoice: dict, db: AsyncSession):
     # Update billing status
     billing_config = tenant.billing_config or {}
     billing_config["subscription_status"] = "past_due"
-    billing_config["payment_failed_at"] = datetime.utcnow().isoformat()
+    billing_config["payment_failed_at"] = int(time.time())  # Unix epoch seconds
     tenant.billing_config = billing_config
     
     await db.commit()
@@ -651,7 +652,7 @@ async def _handle_subscription_deleted(subscription: dict, db: AsyncSession):
     
     billing_config = tenant.billing_config or {}
     billing_config["subscription_status"] = "canceled"
-    billing_config["canceled_at"] = datetime.utcnow().isoformat()
+    billing_config["canceled_at"] = int(time.time())  # Unix epoch seconds
     billing_config["current_plan"] = "starter"
     tenant.billing_config = billing_config
     
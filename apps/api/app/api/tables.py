@@ -19,6 +19,7 @@ from app.core.database import get_db
 from app.core.security import get_current_user, require_waiter
 from app.models.models import User, Table, Order, OrderStatus, TableStatus
 from app.core.websocket_manager import ws_manager
+from app.services import table_cache
 
 
 # ============================================
@@ -147,6 +148,7 @@ async def update_table_status(
     table.status = new_status
     await db.commit()
     await db.refresh(table)
+    table_cache.invalidate(current_user.tenant_id)
     
     # Notify via WebSocket (don't fail the request if WS fails)
     try:
@@ -288,6 +290,7 @@ async def transfer_table(
     dest_table.status = TableStatus.OCCUPIED
     
     await db.commit()
+    table_cache.invalidate(current_user.tenant_id)
     
     # Notify via WebSocket
     await ws_manager.broadcast_to_tenant(
@@ -106,6 +106,8 @@ class Settings(BaseSettings):
     
     # AI Integration
     perplexity_api_key: str = ""
+    # Prophet worker processes (each loads pandas/Prophet: keep small)
+    forecast_workers: int = 1
     
     # Observability - Sentry
     sentry_dsn: str = ""  # Empty = disabled
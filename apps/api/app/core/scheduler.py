@@ -32,6 +32,7 @@ from urllib.parse import urlparse
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from cachetools import TTLCache
 from sqlalchemy import select, update, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -52,6 +53,10 @@ settings = get_settings()
 # Global scheduler instance
 scheduler: Optional[AsyncIOScheduler] = None
 
+# Short-lived snapshot of get_scheduler_status(); next_run times only move
+# when a job fires, so a few seconds of staleness is harmless
+_status_cache: TTLCache = TTLCache(maxsize=1, ttl=5)
+
 # Backup configuration
 BACKUP_DIR = Path(__file__).parent.parent.parent / "backups"
 BACKUP_RETENTION_DAYS = 7
@@ -157,6 +162,7 @@ def start_scheduler():
     
     if not scheduler.running:
         scheduler.start()
+        _status_cache.clear()
         logger.info("✅ Scheduler started successfully")
 
 
@@ -166,6 +172,7 @@ def shutdown_scheduler():
     
     if scheduler and scheduler.running:
         scheduler.shutdown(wait=True)
+        _status_cache.clear()
         logger.info("🛑 Scheduler shut down gracefully")
 
 
@@ -685,13 +692,20 @@ async def run_job_manually(job_name: str) -> dict:
         return {"status": "error", "message": str(e)}
 
 
-def get_scheduler_status() -> dict:
+def get_scheduler_status(force: bool = False) -> dict:
     """
     Get current scheduler status and next run times.
     Useful for admin dashboard.
+    
+    Cached for a few seconds; pass force=True to bypass the cache.
     """
     global scheduler
     
+    if not force:
+        cached = _status_cache.get("status")
+        if cached is not None:
+            return cached
+    
     if scheduler is None or not scheduler.running:
         return {"running": False, "jobs": []}
     
@@ -703,9 +717,11 @@ def get_scheduler_status() -> dict:
             "next_run": job.next_run_time.isoformat() if job.next_run_time else None,
         })
     
-    return {
+    status = {
         "running": True,
         "timezone": "America/Mexico_City",
         "jobs": jobs_info
     }
+    _status_cache["status"] = status
+    return status
 
@@ -3,9 +3,12 @@ RestoNext MX - JWT Authentication & Security
 Role-based access control for restaurant staff
 """
 
+import time
 from datetime import datetime, timedelta
 from typing import Optional
+from uuid import uuid4
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
@@ -42,8 +45,19 @@ class Token(BaseModel):
     expires_in: int
 
 
+# Decoded tokens keyed by the raw token string; entries are also checked
+# against the token's own exp, so a hit never outlives the JWT
+_token_cache: "TTLCache[str, TokenData]" = TTLCache(maxsize=4096, ttl=300)
+
+
+# Marker for accounts that must never log in with a password (system users)
+UNUSABLE_PASSWORD_PREFIX = "!"
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
+    if hashed_password.startswith(UNUSABLE_PASSWORD_PREFIX):
+        return False
     return pwd_context.verify(plain_password, hashed_password)
 
 
@@ -52,6 +66,11 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def make_unusable_password() -> str:
+    """Random non-hash marker that verify_password always rejects (no KDF cost)"""
+    return f"{UNUSABLE_PASSWORD_PREFIX}{uuid4().hex}"
+
+
 def create_access_token(user_id: str, tenant_id: str, role: str) -> Token:
     """Create a JWT access token"""
     expire = datetime.utcnow() + timedelta(minutes=settings.jwt_expire_minutes)
@@ -97,6 +116,20 @@ def decode_token(token: str) -> TokenData:
         ) from e
 
 
+def decode_token_cached(token: str) -> TokenData:
+    """
+    decode_token with a per-token cache, for hot paths that only read the
+    claims (request logging). Invalid tokens raise and are never cached.
+    """
+    token_data = _token_cache.get(token)
+    if token_data is not None and token_data.exp.timestamp() > time.time():
+        return token_data
+    
+    token_data = decode_token(token)
+    _token_cache[token] = token_data
+    return token_data
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
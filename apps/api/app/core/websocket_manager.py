@@ -3,11 +3,13 @@ RestoNext MX - WebSocket Connection Manager
 Redis-backed pub/sub for real-time kitchen updates
 """
 
-import json
 import asyncio
+import logging
+from collections import defaultdict
 from typing import Dict, Set, Optional
 from datetime import datetime
 
+import orjson
 from fastapi import WebSocket
 import redis.asyncio as redis
 
@@ -15,6 +17,37 @@ from app.core.config import get_settings
 
 settings = get_settings()
 
+logger = logging.getLogger("restonext.ws")
+
+# Per-connection outbound buffer size. Broadcasts only enqueue; a relay
+# task per socket does the actual send, so one slow client (a customer
+# phone on poor WiFi) can't stall delivery to the kitchen or POS. Sized
+# well above a burst of back-to-back broadcasts; a client that still falls
+# this far behind is closed (1013) so it reconnects and reloads its state
+# rather than silently missing a ticket
+OUTBOX_SIZE = 256
+
+# Channels whose sockets get bursts coalesced: the relay waits this long
+# after the first pending message and sends everything queued by then as
+# one JSON array frame (a lone message is still sent as a plain object).
+# Only the KDS client understands arrays, and kitchen rushes are where
+# bursts happen; bill requests and waiter calls stay instant
+COALESCE_CHANNELS = frozenset({"kitchen"})
+COALESCE_WINDOW = 0.01  # seconds
+
+# Role channels every instance subscribes to on Redis. Broadcasts to these
+# are published once and fanned out locally by each instance's listener
+REDIS_CHANNELS = ("kitchen", "bar", "waiter", "cashier", "pos", "all")
+
+# Backoff bounds (seconds) for re-subscribing after the pub/sub link drops
+LISTENER_BACKOFF_MIN = 1.0
+LISTENER_BACKOFF_MAX = 30.0
+
+
+def _encode(message) -> str:
+    """Compact JSON text for a WebSocket/Redis message (orjson, not stdlib)"""
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 class ConnectionManager:
     """
@@ -35,8 +68,20 @@ class ConnectionManager:
             "pos": set(),      # For POS stations
             "all": set(),
         }
+        # Live size of each active_connections set, kept in step with it by
+        # _track/_untrack so counts are plain int reads (see get_count)
+        self._counts: Dict[str, int] = defaultdict(int)
         self.redis_client: Optional[redis.Redis] = None
         self.pubsub: Optional[redis.client.PubSub] = None
+        # Background listen_redis task, and whether it is currently
+        # subscribed (broadcasts only rely on it for local delivery then)
+        self._listener: Optional[asyncio.Task] = None
+        self._listening = False
+        # Outbound queue and relay task for each accepted socket
+        self._outboxes: Dict[WebSocket, asyncio.Queue] = {}
+        self._relays: Dict[WebSocket, asyncio.Task] = {}
+        # Pending closes of lagging sockets (kept so the tasks aren't GC'd)
+        self._closers: Set[asyncio.Task] = set()
     
     async def connect_redis(self):
         """
@@ -85,7 +130,7 @@ class ConnectionManager:
             self.pubsub = self.redis_client.pubsub()
             # Subscribe to the SAME role-based channel names that broadcast_to_channel publishes to
             await asyncio.wait_for(
-                self.pubsub.subscribe("kitchen", "bar", "waiter", "cashier", "pos", "all"),
+                self.pubsub.subscribe(*REDIS_CHANNELS),
                 timeout=3.0
             )
             print(f"INFO:     ✅ Connected to Redis successfully")
@@ -107,6 +152,13 @@ class ConnectionManager:
     
     async def disconnect_redis(self):
         """Close Redis connection"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
         if self.pubsub:
             await self.pubsub.unsubscribe()
         if self.redis_client:
@@ -114,51 +166,135 @@ class ConnectionManager:
     
     async def connect(self, websocket: WebSocket, channel: str = "all"):
         """Add a new WebSocket connection to a channel"""
+        # No TCP_NODELAY tweak needed here: asyncio (and uvloop) already
+        # disable Nagle on every TCP transport, so small frames go out
+        # immediately; ASGI does not expose the socket anyway
         await websocket.accept()
         if channel not in self.active_connections:
             self.active_connections[channel] = set()
-        self.active_connections[channel].add(websocket)
-        self.active_connections["all"].add(websocket)
+        self._track(channel, websocket)
+        self._track("all", websocket)
+        if websocket not in self._outboxes:
+            outbox = asyncio.Queue(maxsize=OUTBOX_SIZE)
+            self._outboxes[websocket] = outbox
+            self._relays[websocket] = asyncio.create_task(
+                self._relay(websocket, outbox, coalesce=channel in COALESCE_CHANNELS)
+            )
     
     def disconnect(self, websocket: WebSocket, channel: str = "all"):
         """Remove a WebSocket connection"""
-        if channel in self.active_connections:
-            self.active_connections[channel].discard(websocket)
-        self.active_connections["all"].discard(websocket)
+        self._untrack(channel, websocket)
+        self._untrack("all", websocket)
+        self._close_outbox(websocket)
+    
+    def _track(self, channel: str, websocket: WebSocket):
+        """Add a socket to a channel set, counting it only if it is new"""
+        connections = self.active_connections[channel]
+        if websocket not in connections:
+            connections.add(websocket)
+            self._counts[channel] += 1
+    
+    def _untrack(self, channel: str, websocket: WebSocket):
+        """Remove a socket from a channel set, if it is still there"""
+        connections = self.active_connections.get(channel)
+        if connections is not None and websocket in connections:
+            connections.remove(websocket)
+            self._counts[channel] -= 1
+    
+    def get_count(self, channel: str) -> int:
+        """Number of sockets currently connected to a channel"""
+        return self._counts[channel]
+    
+    def _close_outbox(self, websocket: WebSocket):
+        """Drop a socket's queue and stop its relay task"""
+        self._outboxes.pop(websocket, None)
+        relay = self._relays.pop(websocket, None)
+        if relay is not None and relay is not asyncio.current_task():
+            relay.cancel()
+    
+    async def _relay(self, websocket: WebSocket, outbox: asyncio.Queue, coalesce: bool = False):
+        """Send queued frames to one socket, in order, until it fails"""
+        try:
+            while True:
+                frame = await outbox.get()
+                if coalesce:
+                    await asyncio.sleep(COALESCE_WINDOW)
+                    if not outbox.empty():
+                        # Frames are already JSON: join them into an array
+                        batch = [frame]
+                        while not outbox.empty():
+                            batch.append(outbox.get_nowait())
+                        frame = "[" + ",".join(batch) + "]"
+                await websocket.send_text(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Dead connection: stop routing broadcasts to it
+            for channel in self.active_connections:
+                self._untrack(channel, websocket)
+            self._close_outbox(websocket)
+    
+    def _enqueue(self, websocket: WebSocket, frame: str):
+        """Queue an encoded frame for a socket, closing it if it lags too far"""
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            return
+        if outbox.full():
+            logger.warning("Closing WebSocket %d messages behind", OUTBOX_SIZE)
+            # Stop queueing now; the set removal and close happen in a task,
+            # since callers are iterating the channel set
+            self._close_outbox(websocket)
+            closer = asyncio.create_task(self._close_lagging(websocket))
+            self._closers.add(closer)
+            closer.add_done_callback(self._closers.discard)
+            return
+        outbox.put_nowait(frame)
+    
+    async def _close_lagging(self, websocket: WebSocket):
+        """Drop a socket that fell behind and ask its client to reconnect"""
+        for channel in self.active_connections:
+            self._untrack(channel, websocket)
+        try:
+            await websocket.close(code=1013)  # Try Again Later
+        except Exception:
+            pass
     
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """Send message to a specific client"""
-        await websocket.send_json(message)
+        await websocket.send_text(_encode(message))
     
     async def broadcast_to_channel(self, message: dict, channel: str):
         """
         Broadcast message to all connections in a channel.
         Also publishes to Redis for multi-instance support.
         """
-        # Add timestamp to message
-        message["timestamp"] = datetime.utcnow().isoformat()
+        # Add timestamp to message (on a copy; callers reuse the dict for
+        # other channels) and encode it once for every recipient
+        frame = _encode({**message, "timestamp": datetime.utcnow().isoformat()})
         
-        # Publish to Redis for other API instances
-        if self.redis_client:
-            await self.redis_client.publish(channel, json.dumps(message))
+        # With Redis, publish once: every instance (this one included) fans
+        # the frame out to its own sockets from listen_redis, so local
+        # delivery happens exactly once. While the listener is down
+        # (reconnecting), deliver locally instead of relying on it
+        if self.redis_client and self._listening and channel in REDIS_CHANNELS:
+            try:
+                await self.redis_client.publish(channel, frame)
+                return
+            except Exception as e:
+                print(f"WARNING:  ⚠️ Redis publish failed, delivering locally: {e}")
         
-        # Send to local connections
+        # Queue the same frame for local connections (relays do the sends)
         if channel in self.active_connections:
-            dead_connections = set()
             for connection in self.active_connections[channel]:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    dead_connections.add(connection)
-            
-            # Clean up dead connections
-            for dead in dead_connections:
-                self.disconnect(dead, channel)
+                self._enqueue(connection, frame)
     
     async def notify_kitchen_new_order(self, order_data: dict):
         """Send new order notification to kitchen displays"""
-        kitchen_count = len(self.active_connections.get("kitchen", set()))
-        print(f"INFO:     🔔 Broadcasting kitchen:new_order to {kitchen_count} kitchen connection(s)")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Broadcasting kitchen:new_order to %d kitchen connection(s)",
+                self.get_count("kitchen"),
+            )
         message = {
             "event": "kitchen:new_order",
             "payload": order_data
@@ -300,26 +436,61 @@ class ConnectionManager:
         await self.broadcast_to_channel(message, "cashier")
         await self.broadcast_to_channel(message, "pos")
     
+    def start_listener(self):
+        """Start listen_redis in the background, keeping a handle to it"""
+        if self.pubsub and self._listener is None:
+            self._listener = asyncio.create_task(self.listen_redis())
+    
     async def listen_redis(self):
         """
         Background task to listen for Redis pub/sub messages.
         Forwards messages from other API instances to local WebSocket connections.
-        """
-        if not self.pubsub:
-            return
         
-        async for message in self.pubsub.listen():
-            if message["type"] == "message":
-                channel = message["channel"].decode()
-                data = json.loads(message["data"])
+        If the pub/sub connection drops (Redis restart, failover) it
+        re-subscribes with exponential backoff; until then broadcasts are
+        delivered locally (see broadcast_to_channel).
+        """
+        backoff = LISTENER_BACKOFF_MIN
+        resubscribe = False
+        while self.redis_client is not None:
+            try:
+                if resubscribe:
+                    old, self.pubsub = self.pubsub, self.redis_client.pubsub()
+                    try:
+                        await old.aclose()
+                    except Exception:
+                        pass
+                    await asyncio.wait_for(
+                        self.pubsub.subscribe(*REDIS_CHANNELS), timeout=3.0
+                    )
+                    logger.info("Redis pub/sub listener resubscribed")
                 
-                # Forward to local connections
-                if channel in self.active_connections:
-                    for connection in self.active_connections[channel].copy():
-                        try:
-                            await connection.send_json(data)
-                        except Exception:
-                            self.disconnect(connection, channel)
+                self._listening = True
+                async for message in self.pubsub.listen():
+                    backoff = LISTENER_BACKOFF_MIN
+                    if message["type"] == "message":
+                        channel = message["channel"].decode()
+                        # Published frames are already encoded JSON: forward as is
+                        frame = message["data"].decode()
+                        
+                        # Forward to local connections
+                        if channel in self.active_connections:
+                            for connection in self.active_connections[channel]:
+                                self._enqueue(connection, frame)
+                return  # Unsubscribed (shutdown)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "Redis pub/sub listener failed (%s: %s); retrying in %.0fs",
+                    type(e).__name__, e, backoff,
+                )
+            finally:
+                self._listening = False
+            
+            resubscribe = True
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, LISTENER_BACKOFF_MAX)
 
 
 # Global instance
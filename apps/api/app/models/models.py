@@ -1442,6 +1442,13 @@ class Reservation(Base):
     
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
+    # ============================================
+    # Performance Indices (availability overlap scan)
+    # ============================================
+    __table_args__ = (
+        Index('ix_reservations_tenant_status_time', 'tenant_id', 'status', 'reservation_time'),
+    )
+    
     # Relationships
     customer: Mapped["Customer"] = relationship(back_populates="reservations")
     agent: Mapped["CommissionAgent"] = relationship(back_populates="reservations")
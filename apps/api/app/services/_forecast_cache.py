@@ -0,0 +1,35 @@
+"""
+RestoNext MX - Forecast Cache
+In-process TTL memoization for ingredient demand forecasts.
+
+Prophet fits are expensive and, within the same day, produce the same
+prediction for the same ingredient. Only the summed predicted demand
+(a float) is stored so the cache stays tiny.
+"""
+
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from cachetools import TTLCache
+
+# Key: (tenant_id, ingredient_name, utc_date, forecast_days)
+ForecastKey = Tuple[UUID, str, str, int]
+
+_cache: "TTLCache[ForecastKey, float]" = TTLCache(maxsize=5000, ttl=3600)
+
+
+def make_key(tenant_id: UUID, ingredient_name: str, forecast_days: int) -> ForecastKey:
+    """Build the cache key for today's forecast of an ingredient."""
+    today = datetime.utcnow().date().isoformat()
+    return (tenant_id, ingredient_name, today, forecast_days)
+
+
+def get_predicted_demand(key: ForecastKey) -> Optional[float]:
+    """Return the cached predicted demand, or None on a miss."""
+    return _cache.get(key)
+
+
+def set_predicted_demand(key: ForecastKey, predicted_demand: float) -> None:
+    """Store the predicted demand for a forecast key."""
+    _cache[key] = predicted_demand
@@ -0,0 +1,31 @@
+"""
+RestoNext MX - Forecast Worker
+Process-pool entry point for Prophet forecasts.
+
+Kept deliberately light: spawned workers import only this module and
+app.services.forecasting (whose pandas/Prophet imports are lazy), never
+app.models, the database layer or the rest of the service package.
+"""
+
+from typing import List, Optional
+
+from app.services.forecasting import forecast_ingredient_demand, generate_sample_sales_data
+
+
+def run_prophet(
+    ingredient_name: str,
+    forecast_days: int,
+    sales_data: Optional[List[dict]] = None
+) -> dict:
+    """
+    Run the Prophet forecast for one ingredient.
+    Executed inside the process pool, so it must stay a module-level function.
+    """
+    # Fallback to sample data if there is not enough real history
+    if not sales_data:
+        sales_data = generate_sample_sales_data(ingredient_name, days=90)
+    return forecast_ingredient_demand(
+        sales_data,
+        ingredient_name,
+        days_ahead=forecast_days
+    )
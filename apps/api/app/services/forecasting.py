@@ -11,8 +11,11 @@ NOTE: Prophet and pandas are LAZY IMPORTED to avoid loading ~200MB+
 of libraries at startup (which causes OOM on small Railway containers)
 """
 
-from datetime import datetime, timedelta
-from typing import List, Optional, Any
+import logging
+from datetime import datetime, time, timedelta
+from typing import List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
 
 # Lazy import flags
 _pd = None
@@ -325,6 +328,78 @@ async def fetch_sales_from_db(
         return []
 
 
+async def fetch_sales_matrix_from_db(
+    db_session,
+    tenant_id,
+    ingredient_ids: List[Any],
+    days: int = 90,
+) -> Optional[Tuple[Any, List[Any], List[str]]]:
+    """
+    Fetch daily consumption for many ingredients with a single query.
+    
+    Rows of (ingredient_id, date, quantity_sold) are pivoted in-process into
+    a (len(ingredient_ids), days) float32 matrix, zero-filled for days without
+    movements. Row order matches `ingredient_ids`.
+    
+    Returns (matrix, ingredient_ids, dates) or None if unavailable.
+    """
+    if not ingredient_ids or not _ensure_ai_libs():
+        return None
+    
+    from sqlalchemy import select, func, cast, Date
+    from app.models.models import InventoryTransaction, TransactionType
+    
+    # created_at holds naive UTC (datetime.utcnow), so its ::date is the UTC
+    # day; the cutoff and the matrix's date axis use the same UTC "today",
+    # covering exactly the last `days` UTC days including today
+    today = datetime.utcnow().date()
+    cutoff_date = datetime.combine(today - timedelta(days=days - 1), time.min)
+    day = cast(InventoryTransaction.created_at, Date)
+    
+    try:
+        stmt = (
+            select(
+                InventoryTransaction.ingredient_id,
+                day.label("date"),
+                func.sum(func.abs(InventoryTransaction.quantity)).label("quantity_sold"),
+            )
+            .where(
+                InventoryTransaction.tenant_id == tenant_id,
+                InventoryTransaction.ingredient_id.in_(ingredient_ids),
+                InventoryTransaction.created_at >= cutoff_date,
+                InventoryTransaction.transaction_type.in_(
+                    [TransactionType.SALE, TransactionType.WASTE]
+                ),
+            )
+            .group_by(InventoryTransaction.ingredient_id, day)
+        )
+        
+        result = await db_session.execute(stmt)
+        rows = result.all()
+    except Exception as e:
+        logger.warning("Failed to fetch sales matrix from DB: %s", e)
+        return None
+    
+    global _pd
+    dates = _pd.date_range(end=_pd.Timestamp(today), periods=days)
+    df = _pd.DataFrame(rows, columns=["ingredient_id", "date", "quantity_sold"])
+    df["date"] = _pd.to_datetime(df["date"])
+    
+    matrix = (
+        df.pivot_table(
+            index="ingredient_id",
+            columns="date",
+            values="quantity_sold",
+            aggfunc="sum",
+        )
+        .reindex(index=ingredient_ids, columns=dates)
+        .fillna(0)
+        .to_numpy(dtype="float32")
+    )
+    
+    return matrix, list(ingredient_ids), [d.strftime('%Y-%m-%d') for d in dates]
+
+
 async def get_forecast_for_ingredient(
     tenant_id: str,
     ingredient: str,
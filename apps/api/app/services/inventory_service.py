@@ -9,10 +9,11 @@ This service handles:
 """
 
 import logging
-from typing import Optional, List
+from typing import Optional, List, Dict
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update, insert, values, column, Float
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -311,6 +312,95 @@ async def update_stock(
     return transaction
 
 
+async def update_stock_many(
+    db: AsyncSession,
+    tenant_id: UUID,
+    deltas: List[dict],
+    transaction_type: TransactionType,
+    user_id: Optional[UUID] = None,
+    notes: Optional[str] = None,
+    reference_type: Optional[str] = None,
+    reference_id: Optional[UUID] = None
+) -> None:
+    """
+    Batch version of update_stock.
+    
+    Applies all stock changes with a single UPDATE ... FROM (VALUES ...)
+    and records every InventoryTransaction with one executemany INSERT.
+    
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        deltas: List of {ingredient_id: UUID, quantity: float}
+        transaction_type: Type of transaction
+        user_id: User performing the action
+        notes: Optional transaction notes
+        reference_type: Optional reference type (e.g., "purchase_order")
+        reference_id: Optional reference document ID
+    
+    Raises:
+        InventoryError: If any ingredient is not found for the tenant
+    """
+    if not deltas:
+        return
+    
+    # Net change per ingredient (an ingredient may appear more than once)
+    totals: Dict[UUID, float] = {}
+    for delta in deltas:
+        ingredient_id = delta["ingredient_id"]
+        totals[ingredient_id] = totals.get(ingredient_id, 0.0) + delta["quantity"]
+    
+    changes = values(
+        column("ingredient_id", PG_UUID(as_uuid=True)),
+        column("quantity", Float),
+        name="changes"
+    ).data(list(totals.items()))
+    
+    result = await db.execute(
+        update(Ingredient)
+        .where(
+            Ingredient.id == changes.c.ingredient_id,
+            Ingredient.tenant_id == tenant_id
+        )
+        .values(
+            stock_quantity=Ingredient.stock_quantity + changes.c.quantity
+        )
+        .returning(Ingredient.id, Ingredient.stock_quantity, Ingredient.unit)
+        .execution_options(synchronize_session=False)
+    )
+    updated = {row.id: row for row in result.all()}
+    
+    missing = totals.keys() - updated.keys()
+    if missing:
+        raise InventoryError(
+            f"Ingredient {next(iter(missing))} not found for tenant"
+        )
+    
+    # Rebuild the running balance so each transaction has its stock_after
+    balances = {
+        ingredient_id: row.stock_quantity - totals[ingredient_id]
+        for ingredient_id, row in updated.items()
+    }
+    transaction_rows = []
+    for delta in deltas:
+        ingredient_id = delta["ingredient_id"]
+        balances[ingredient_id] += delta["quantity"]
+        transaction_rows.append({
+            "tenant_id": tenant_id,
+            "ingredient_id": ingredient_id,
+            "transaction_type": transaction_type,
+            "quantity": delta["quantity"],
+            "unit": updated[ingredient_id].unit,
+            "reference_type": reference_type,
+            "reference_id": reference_id,
+            "stock_after": balances[ingredient_id],
+            "notes": notes,
+            "created_by": user_id,
+        })
+    
+    await db.execute(insert(InventoryTransaction), transaction_rows)
+
+
 async def get_low_stock_ingredients(
     db: AsyncSession,
     tenant_id: UUID
@@ -10,15 +10,22 @@ This service:
 5. Handles atomic transactions for order creation
 """
 
+import asyncio
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import select, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.config import get_settings
 from app.models.models import (
     Ingredient, Supplier, SupplierIngredient,
     PurchaseOrder, PurchaseOrderItem, PurchaseOrderStatus,
@@ -29,11 +36,80 @@ from app.schemas.procurement_schemas import (
     IngredientSuggestion, SupplierSuggestion, ProcurementSuggestionsResponse,
     PurchaseOrderCreate, PurchaseOrderItemCreate
 )
-from app.services.forecasting import forecast_ingredient_demand, generate_sample_sales_data
-from app.services.inventory_service import update_stock
+from app.services import _forecast_cache as forecast_cache
+from app.services.forecasting import fetch_sales_matrix_from_db
+from app.services.forecast_worker import run_prophet
+from app.services.inventory_service import update_stock_many
 
 logger = logging.getLogger(__name__)
 
+def _forecast_worker_count() -> int:
+    """Configured worker count, capped by the CPUs this process may use."""
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        available = os.cpu_count() or 1
+    return max(1, min(get_settings().forecast_workers, available))
+
+
+# Prophet/Stan fits are CPU-bound native code: run them in worker processes
+# so concurrent ingredient analyses neither block the event loop nor the GIL.
+# Each worker loads pandas/Prophet, so the count is a small setting
+# (FORECAST_WORKERS) rather than the host CPU count
+_FORECAST_WORKERS = _forecast_worker_count()
+_PROC_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _get_proc_pool() -> ProcessPoolExecutor:
+    """
+    Lazily create the forecasting process pool.
+    
+    Workers are spawned, not forked: the API process already runs threads
+    (to_thread pool, APScheduler), and forking a threaded process can
+    deadlock the child on a lock held by another thread.
+    """
+    global _PROC_POOL
+    if _PROC_POOL is None:
+        _PROC_POOL = ProcessPoolExecutor(
+            max_workers=_FORECAST_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _PROC_POOL
+
+
+async def _run_in_proc_pool(fn, *args):
+    """
+    Run fn(*args) in the forecasting pool.
+    
+    A worker that dies (e.g. a Stan crash) breaks the whole pool, so the
+    broken pool is replaced and the call retried once.
+    """
+    global _PROC_POOL
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = _get_proc_pool()
+        try:
+            return await loop.run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            if _PROC_POOL is pool:
+                logger.warning("Forecasting process pool broke; recreating it")
+                _PROC_POOL = None
+                pool.shutdown(wait=False, cancel_futures=True)
+            if attempt:
+                raise
+
+
+def shutdown_proc_pool() -> None:
+    """Stop the forecasting workers (called on application shutdown)."""
+    global _PROC_POOL
+    if _PROC_POOL is not None:
+        _PROC_POOL.shutdown(wait=False, cancel_futures=True)
+        _PROC_POOL = None
+
+
+# Minimum days with recorded consumption before real data replaces samples
+MIN_SALES_DAYS = 14
+
 
 class ProcurementError(Exception):
     """Base exception for procurement operations"""
@@ -89,7 +165,7 @@ class PurchaseRecommender:
                 Ingredient.is_active == True
             )
         )
-        ingredients = list(ingredients_result.scalars().all())
+        ingredients = ingredients_result.scalars().all()
         
         # AI Context Analysis
         ai_service = AIService()
@@ -118,17 +194,37 @@ class PurchaseRecommender:
         # Build suggestions
         suggestions_by_supplier: Dict[UUID, SupplierSuggestion] = {}
         unassigned_ingredients: List[IngredientSuggestion] = []
+        total_cost = 0.0
         
-        for ingredient in ingredients:
-            suggestion = await self._analyze_ingredient(ingredient, forecast_days, ai_multiplier)
-            
+        # Real consumption history for every ingredient in one query
+        sales_history = await self._load_sales_history([i.id for i in ingredients])
+        
+        # Analyze all ingredients concurrently, bounded by the worker count
+        semaphore = asyncio.Semaphore(_FORECAST_WORKERS)
+        
+        async def analyze(ingredient: Ingredient) -> Optional[IngredientSuggestion]:
+            async with semaphore:
+                return await self._analyze_ingredient(
+                    ingredient,
+                    forecast_days,
+                    ai_multiplier,
+                    sales_data=sales_history.get(ingredient.id)
+                )
+        
+        tasks = [asyncio.create_task(analyze(ingredient)) for ingredient in ingredients]
+        results = await asyncio.gather(*tasks)
+        
+        for suggestion in results:
             if suggestion is None:
                 continue  # No shortage predicted
             
+            total_cost += suggestion.estimated_cost
+            
             if suggestion.preferred_supplier_id:
                 supplier_id = suggestion.preferred_supplier_id
                 if supplier_id not in suggestions_by_supplier:
-                    suggestions_by_supplier[supplier_id] = SupplierSuggestion(
+                    # Built internally from validated data: skip validation
+                    suggestions_by_supplier[supplier_id] = SupplierSuggestion.model_construct(
                         supplier_id=supplier_id,
                         supplier_name=suggestion.preferred_supplier_name or "Unknown",
                         items=[],
@@ -139,10 +235,6 @@ class PurchaseRecommender:
             else:
                 unassigned_ingredients.append(suggestion)
         
-        # Calculate total
-        total_cost = sum(s.estimated_total for s in suggestions_by_supplier.values())
-        total_cost += sum(i.estimated_cost for i in unassigned_ingredients)
-        
         return ProcurementSuggestionsResponse(
             generated_at=datetime.utcnow(),
             forecast_days=forecast_days,
@@ -153,33 +245,66 @@ class PurchaseRecommender:
             ai_demand_multiplier=ai_multiplier
         )
     
+    async def _load_sales_history(
+        self,
+        ingredient_ids: List[UUID],
+        days: int = 90
+    ) -> Dict[UUID, List[dict]]:
+        """
+        Load real consumption history for all ingredients with a single query.
+        
+        Only ingredients with at least MIN_SALES_DAYS days of recorded
+        consumption are returned; the rest fall back to sample data.
+        """
+        loaded = await fetch_sales_matrix_from_db(
+            self.db, self.tenant_id, ingredient_ids, days=days
+        )
+        if loaded is None:
+            return {}
+        
+        matrix, row_ids, dates = loaded
+        active_days = (matrix > 0).sum(axis=1)
+        
+        history: Dict[UUID, List[dict]] = {}
+        for row, ingredient_id in enumerate(row_ids):
+            if active_days[row] < MIN_SALES_DAYS:
+                continue
+            history[ingredient_id] = [
+                {"date": day, "quantity_sold": float(qty)}
+                for day, qty in zip(dates, matrix[row])
+            ]
+        return history
+    
     async def _analyze_ingredient(
         self,
         ingredient: Ingredient,
         forecast_days: int,
-        demand_multiplier: float = 1.0
+        demand_multiplier: float = 1.0,
+        sales_data: Optional[List[dict]] = None
     ) -> Optional[IngredientSuggestion]:
         """
         Analyze a single ingredient and return suggestion if needed.
         """
-        # Get forecast for this ingredient
-        # For production, would fetch real sales data from DailySales table
-        sales_data = generate_sample_sales_data(ingredient.name, days=90)
-        forecast = forecast_ingredient_demand(
-            sales_data,
-            ingredient.name,
-            days_ahead=forecast_days
-        )
-        
-        # Calculate predicted demand (sum of 7 days)
-        if forecast.get("error") or not forecast.get("predictions"):
-            # Use simple average if Prophet fails
-            predicted_demand = ingredient.min_stock_alert * 2  # Conservative estimate
-        else:
-            predicted_demand = sum(
-                p.get("predicted_demand", 0) 
-                for p in forecast["predictions"]
+        # Reuse today's forecast if this ingredient was already analyzed
+        cache_key = forecast_cache.make_key(self.tenant_id, ingredient.name, forecast_days)
+        predicted_demand = forecast_cache.get_predicted_demand(cache_key)
+        
+        if predicted_demand is None:
+            # Get forecast for this ingredient (off the event loop)
+            forecast = await _run_in_proc_pool(
+                run_prophet, ingredient.name, forecast_days, sales_data
             )
+            
+            # Calculate predicted demand (sum of 7 days)
+            if forecast.get("error") or not forecast.get("predictions"):
+                # Use simple average if Prophet fails (not cached, retry next call)
+                predicted_demand = ingredient.min_stock_alert * 2  # Conservative estimate
+            else:
+                predicted_demand = sum(
+                    p.get("predicted_demand", 0) 
+                    for p in forecast["predictions"]
+                )
+                forecast_cache.set_predicted_demand(cache_key, predicted_demand)
         
         # Apply AI Multiplier
         predicted_demand = predicted_demand * demand_multiplier
@@ -226,7 +351,7 @@ class PurchaseRecommender:
                     suggested_quantity = si.min_order_quantity
                 break
         
-        return IngredientSuggestion(
+        return IngredientSuggestion.model_construct(
             ingredient_id=ingredient.id,
             ingredient_name=ingredient.name,
             unit=ingredient.unit.value,
@@ -282,20 +407,20 @@ class PurchaseRecommender:
         
         # Calculate totals
         subtotal = 0.0
-        order_items: List[PurchaseOrderItem] = []
+        item_rows: List[dict] = []
         
         for item in items:
             total_cost = item.quantity_ordered * item.unit_cost
             subtotal += total_cost
             
-            order_items.append(PurchaseOrderItem(
-                ingredient_id=item.ingredient_id,
-                quantity_ordered=item.quantity_ordered,
-                quantity_received=0.0,
-                unit_cost=item.unit_cost,
-                total_cost=total_cost,
-                notes=item.notes
-            ))
+            item_rows.append({
+                "ingredient_id": item.ingredient_id,
+                "quantity_ordered": item.quantity_ordered,
+                "quantity_received": 0.0,
+                "unit_cost": item.unit_cost,
+                "total_cost": total_cost,
+                "notes": item.notes,
+            })
         
         # Assume 16% IVA for purchases (Mexican tax)
         tax = subtotal * 0.16
@@ -317,22 +442,21 @@ class PurchaseRecommender:
         self.db.add(purchase_order)
         await self.db.flush()  # Get the ID
         
-        # Add items to order
-        for order_item in order_items:
-            order_item.purchase_order_id = purchase_order.id
-            self.db.add(order_item)
+        # Add items to order (single executemany INSERT ... RETURNING)
+        order_items: List[PurchaseOrderItem] = []
+        if item_rows:
+            for row in item_rows:
+                row["purchase_order_id"] = purchase_order.id
+            result = await self.db.scalars(
+                insert(PurchaseOrderItem).returning(PurchaseOrderItem), item_rows
+            )
+            order_items = list(result.all())
         
-        await self.db.flush()
+        # Populate relationships from what we already have instead of reloading
+        set_committed_value(purchase_order, "supplier", supplier)
+        set_committed_value(purchase_order, "items", order_items)
         
-        # Reload with relationships
-        result = await self.db.execute(
-            select(PurchaseOrder)
-            .options(
-                selectinload(PurchaseOrder.supplier),
-                selectinload(PurchaseOrder.items)
-            )
-            .where(PurchaseOrder.id == purchase_order.id)
-        )
+        return purchase_order
         
     async def generate_ai_purchase_proposal(self, user_id: Optional[UUID] = None) -> List[PurchaseOrder]:
         """
@@ -421,14 +545,22 @@ async def receive_purchase_order(
         raise PurchaseOrderNotFoundError(f"Purchase order {order_id} not found")
     
     # Build lookup for items
-    items_lookup = {str(item.id): item for item in order.items}
+    items_lookup = {item.id: item for item in order.items}
     
     all_fully_received = True
+    stock_deltas: List[dict] = []
     
     for received in received_items:
-        item_id = str(received.get("item_id"))
+        item_id = received.get("item_id")
         qty_received = received.get("quantity_received", 0)
         
+        if not isinstance(item_id, UUID):
+            try:
+                item_id = UUID(str(item_id))
+            except ValueError:
+                logger.warning(f"Invalid item id {item_id} for order {order_id}")
+                continue
+        
         if item_id not in items_lookup:
             logger.warning(f"Item {item_id} not found in order {order_id}")
             continue
@@ -442,18 +574,22 @@ async def receive_purchase_order(
         if item.quantity_received < item.quantity_ordered:
             all_fully_received = False
         
-        # Update ingredient stock
-        await update_stock(
-            db=db,
-            tenant_id=tenant_id,
-            ingredient_id=item.ingredient_id,
-            quantity=qty_received,
-            transaction_type=TransactionType.PURCHASE,
-            user_id=user_id,
-            notes=f"Received from PO {order_id}" + (f": {notes}" if notes else ""),
-            reference_type="purchase_order",
-            reference_id=order_id
-        )
+        stock_deltas.append({
+            "ingredient_id": item.ingredient_id,
+            "quantity": qty_received,
+        })
+    
+    # Update ingredient stock for all received lines at once
+    await update_stock_many(
+        db=db,
+        tenant_id=tenant_id,
+        deltas=stock_deltas,
+        transaction_type=TransactionType.PURCHASE,
+        user_id=user_id,
+        notes=f"Received from PO {order_id}" + (f": {notes}" if notes else ""),
+        reference_type="purchase_order",
+        reference_id=order_id
+    )
     
     # Update order status
     if all_fully_received:
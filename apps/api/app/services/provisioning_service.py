@@ -13,13 +13,18 @@ Author: RestoNext Team
 """
 
 import os
+import time
+import asyncio
 import secrets
 import logging
-from datetime import datetime
-from typing import Optional, Dict, Any
+from functools import partial
+from typing import Optional, Dict, Any, Set, Tuple
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import String, bindparam, select, update, func, literal, literal_column
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.models import Tenant, User, UserRole
 from app.services.email_service import EmailService
@@ -30,6 +35,86 @@ logger = logging.getLogger(__name__)
 # Configuration
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
+# Literal key (not a bound parameter) so the planner can match the
+# ix_tenant_stripe_customer expression index
+_STRIPE_CUSTOMER_ID = Tenant.billing_config.op("->>")(literal_column("'stripe_customer_id'"))
+_PROVISIONED_AT = Tenant.billing_config.op("->>")(literal_column("'provisioned_at'"))
+
+# Webhook statements built once at import; executed with bound parameters
+# so SQLAlchemy's compiled cache is hit on every call
+_ADMIN_OF_TENANT = (User.tenant_id == Tenant.id) & (User.role == UserRole.ADMIN)
+
+_PROVISIONED_AT_BY_TENANT = select(_PROVISIONED_AT).where(
+    Tenant.id == bindparam("tenant_id")
+)
+_TENANT_BY_ID = select(Tenant).where(Tenant.id == bindparam("tenant_id"))
+_TENANT_ID_BY_CUSTOMER = select(Tenant.id).where(
+    _STRIPE_CUSTOMER_ID == bindparam("customer_id", type_=String)
+)
+_TENANT_ADMIN_BY_CUSTOMER = (
+    select(Tenant, User)
+    .outerjoin(User, _ADMIN_OF_TENANT)
+    .where(_STRIPE_CUSTOMER_ID == bindparam("customer_id", type_=String))
+    .limit(1)
+)
+_TENANT_ADMIN_BY_ID = (
+    select(Tenant, User)
+    .outerjoin(User, _ADMIN_OF_TENANT)
+    .where(Tenant.id == bindparam("tenant_id"))
+    .limit(1)
+)
+# Prefer the user from the checkout metadata, fall back to any admin
+_TENANT_USER_BY_ID = (
+    select(Tenant, User)
+    .outerjoin(User, (User.id == bindparam("user_id")) | _ADMIN_OF_TENANT)
+    .where(Tenant.id == bindparam("tenant_id"))
+    .order_by((User.id == bindparam("user_id")).desc().nulls_last())
+    .limit(1)
+)
+
+# Addons per plan, precomputed once; callers receive a shallow copy
+_BASE_ADDONS: Dict[str, bool] = {
+    "self_service": True,  # Core feature: QR self-ordering enabled for ALL plans
+    "kds_pro": False,
+    "analytics_ai": False,
+    "multi_branch": False,
+    "inventory": False,
+    "catering": False,
+    "loyalty": False,
+    "reservations": False,
+    "promotions": False,
+    "admin_access": False,
+}
+
+_PLAN_ADDONS: Dict[str, Dict[str, bool]] = {
+    "starter": {**_BASE_ADDONS, "inventory": True},
+    "professional": {
+        **_BASE_ADDONS,
+        "kds_pro": True,
+        "inventory": True,
+        "catering": True,
+        "loyalty": True,
+        "reservations": True,
+    },
+    "enterprise": {addon: True for addon in _BASE_ADDONS},
+}
+
+# Strong references to in-flight background tasks (the event loop only
+# keeps weak references, so unreferenced tasks may be garbage collected)
+_background_tasks: Set["asyncio.Task[None]"] = set()
+
+
+def _on_welcome_email_done(email: str, task: "asyncio.Task[None]") -> None:
+    """Release the task and log its outcome; email errors never fail provisioning."""
+    _background_tasks.discard(task)
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc:
+        logger.error(f"Failed to send welcome email: {exc}", exc_info=exc)
+    else:
+        logger.info(f"Welcome email sent to {email}")
+
 
 class ProvisioningService:
     """
@@ -73,38 +158,52 @@ class ProvisioningService:
             logger.warning(f"No tenant_id in checkout metadata: {metadata}")
             return False
         
-        # ============================================
-        # Step 1: Find or Create Tenant
-        # ============================================
+        # Check if already provisioned (idempotency) without hydrating the
+        # tenant row: webhook retries stop here
         result = await self.db.execute(
-            select(Tenant).where(Tenant.id == tenant_id)
+            _PROVISIONED_AT_BY_TENANT, {"tenant_id": tenant_id}
         )
-        tenant = result.scalar_one_or_none()
+        if result.scalar_one_or_none():
+            logger.info(f"Tenant {tenant_id} already provisioned, skipping")
+            return True
+        
+        # ============================================
+        # Step 1: Find Tenant and Admin User (single round-trip)
+        # ============================================
+        user_uuid = None
+        if user_id:
+            try:
+                user_uuid = UUID(str(user_id))
+            except ValueError:
+                logger.warning(f"Invalid user_id in checkout metadata: {user_id}")
+        
+        if user_uuid:
+            result = await self.db.execute(
+                _TENANT_USER_BY_ID, {"tenant_id": tenant_id, "user_id": user_uuid}
+            )
+        else:
+            result = await self.db.execute(_TENANT_ADMIN_BY_ID, {"tenant_id": tenant_id})
+        row = result.first()
+        tenant, user = (row[0], row[1]) if row else (None, None)
         
         if not tenant:
             logger.error(f"Tenant not found: {tenant_id}")
             return False
         
-        # Check if already provisioned (idempotency)
-        billing_config = tenant.billing_config or {}
-        if billing_config.get("provisioned_at"):
-            logger.info(f"Tenant {tenant_id} already provisioned, skipping")
-            return True
-        
         # ============================================
         # Step 2: Update Tenant Subscription
         # ============================================
         new_addons = self._get_plan_addons(plan)
         tenant.active_addons = new_addons
         
-        billing_config["stripe_customer_id"] = customer_id
-        billing_config["stripe_subscription_id"] = subscription_id
-        billing_config["subscription_status"] = "active"
-        billing_config["current_plan"] = plan
-        billing_config["provisioned_at"] = datetime.utcnow().isoformat()
-        billing_config["provisioned_by"] = "stripe_webhook"
-        
-        tenant.billing_config = billing_config
+        await self._patch_billing(tenant, {
+            "stripe_customer_id": customer_id,
+            "stripe_subscription_id": subscription_id,
+            "subscription_status": "active",
+            "current_plan": plan,
+            "provisioned_at": int(time.time()),  # Unix epoch seconds
+            "provisioned_by": "stripe_webhook",
+        })
         
         # Mark onboarding step
         if is_signup:
@@ -113,46 +212,24 @@ class ProvisioningService:
         logger.info(f"Activated plan '{plan}' for tenant {tenant_id}")
         
         # ============================================
-        # Step 3: Find Admin User
+        # Step 3: Commit Changes
         # ============================================
-        user = None
-        if user_id:
-            result = await self.db.execute(
-                select(User).where(User.id == user_id)
-            )
-            user = result.scalar_one_or_none()
-        
-        if not user:
-            # Find any admin for this tenant
-            result = await self.db.execute(
-                select(User).where(
-                    User.tenant_id == tenant_id,
-                    User.role == UserRole.ADMIN
-                )
-            )
-            user = result.scalar_one_or_none()
+        await self.db.commit()
         
         # ============================================
-        # Step 4: Send Welcome Email
+        # Step 4: Send Welcome Email (background)
         # ============================================
+        # Fire-and-forget so SMTP latency doesn't delay the Stripe response
         if user and is_signup:
-            try:
-                await self._send_welcome_email(
-                    email=user.email,
-                    name=user.name,
-                    restaurant_name=tenant.name,
-                    plan=plan,
-                    login_url=f"{FRONTEND_URL}/login",
-                )
-                logger.info(f"Welcome email sent to {user.email}")
-            except Exception as e:
-                logger.error(f"Failed to send welcome email: {e}")
-                # Don't fail provisioning due to email error
-        
-        # ============================================
-        # Step 5: Commit Changes
-        # ============================================
-        await self.db.commit()
+            task = asyncio.create_task(self._send_welcome_email(
+                email=user.email,
+                name=user.name,
+                restaurant_name=tenant.name,
+                plan=plan,
+                login_url=f"{FRONTEND_URL}/login",
+            ))
+            _background_tasks.add(task)
+            task.add_done_callback(partial(_on_welcome_email_done, user.email))
         
         logger.info(f"Successfully provisioned tenant {tenant_id} with plan {plan}")
         return True
@@ -176,35 +253,30 @@ class ProvisioningService:
             customer_id = subscription.get("customer")
             if customer_id:
                 result = await self.db.execute(
-                    select(Tenant).where(
-                        Tenant.billing_config["stripe_customer_id"].astext == customer_id
-                    )
+                    _TENANT_ID_BY_CUSTOMER, {"customer_id": customer_id}
                 )
-                tenant = result.scalar_one_or_none()
-                if tenant:
-                    tenant_id = str(tenant.id)
+                found_id = result.scalar_one_or_none()
+                if found_id:
+                    tenant_id = str(found_id)
         
         if not tenant_id:
             logger.warning(f"Could not find tenant for subscription: {subscription.get('id')}")
             return False
         
-        result = await self.db.execute(
-            select(Tenant).where(Tenant.id == tenant_id)
-        )
+        result = await self.db.execute(_TENANT_BY_ID, {"tenant_id": tenant_id})
         tenant = result.scalar_one_or_none()
         
         if not tenant:
             return False
         
         # Update subscription status
-        billing_config = tenant.billing_config or {}
-        billing_config["subscription_status"] = subscription.get("status", "active")
+        billing_patch = {"subscription_status": subscription.get("status", "active")}
         
         if plan:
-            billing_config["current_plan"] = plan
+            billing_patch["current_plan"] = plan
             tenant.active_addons = self._get_plan_addons(plan)
         
-        tenant.billing_config = billing_config
+        await self._patch_billing(tenant, billing_patch)
         await self.db.commit()
         
         return True
@@ -224,12 +296,7 @@ class ProvisioningService:
         if not customer_id:
             return False
         
-        result = await self.db.execute(
-            select(Tenant).where(
-                Tenant.billing_config["stripe_customer_id"].astext == customer_id
-            )
-        )
-        tenant = result.scalar_one_or_none()
+        tenant, admin = await self._get_tenant_and_admin_by_customer(customer_id)
         
         if not tenant:
             return False
@@ -237,23 +304,15 @@ class ProvisioningService:
         # Downgrade to starter (free tier)
         tenant.active_addons = self._get_plan_addons("starter")
         
-        billing_config = tenant.billing_config or {}
-        billing_config["subscription_status"] = "canceled"
-        billing_config["current_plan"] = "starter"
-        billing_config["canceled_at"] = datetime.utcnow().isoformat()
-        tenant.billing_config = billing_config
+        await self._patch_billing(tenant, {
+            "subscription_status": "canceled",
+            "current_plan": "starter",
+            "canceled_at": int(time.time()),  # Unix epoch seconds
+        })
         
         await self.db.commit()
         
         # Send cancellation email
-        result = await self.db.execute(
-            select(User).where(
-                User.tenant_id == tenant.id,
-                User.role == UserRole.ADMIN
-            )
-        )
-        admin = result.scalar_one_or_none()
-        
         if admin:
             try:
                 await self.email_service.send_subscription_canceled(
@@ -282,34 +341,21 @@ class ProvisioningService:
         if not customer_id:
             return False
         
-        result = await self.db.execute(
-            select(Tenant).where(
-                Tenant.billing_config["stripe_customer_id"].astext == customer_id
-            )
-        )
-        tenant = result.scalar_one_or_none()
+        tenant, admin = await self._get_tenant_and_admin_by_customer(customer_id)
         
         if not tenant:
             return False
         
         # Update status
-        billing_config = tenant.billing_config or {}
-        billing_config["subscription_status"] = "past_due"
-        billing_config["payment_failed_at"] = datetime.utcnow().isoformat()
-        billing_config["failed_invoice_id"] = invoice.get("id")
-        tenant.billing_config = billing_config
+        await self._patch_billing(tenant, {
+            "subscription_status": "past_due",
+            "payment_failed_at": int(time.time()),  # Unix epoch seconds
+            "failed_invoice_id": invoice.get("id"),
+        })
         
         await self.db.commit()
         
         # Send payment failed email
-        result = await self.db.execute(
-            select(User).where(
-                User.tenant_id == tenant.id,
-                User.role == UserRole.ADMIN
-            )
-        )
-        admin = result.scalar_one_or_none()
-        
         if admin:
             try:
                 await self.email_service.send_payment_failed(
@@ -324,47 +370,43 @@ class ProvisioningService:
         logger.warning(f"Payment failed for tenant {tenant.id}")
         return True
     
+    async def _patch_billing(self, tenant: Tenant, patch: Dict[str, Any]) -> None:
+        """
+        Merge keys into tenant.billing_config server-side with JSONB `||`,
+        instead of re-serializing the whole blob through the ORM.
+        """
+        await self.db.execute(
+            update(Tenant)
+            .where(Tenant.id == tenant.id)
+            .values(
+                billing_config=func.coalesce(
+                    Tenant.billing_config, literal({}, JSONB)
+                ).op("||", return_type=JSONB)(literal(patch, JSONB))
+            )
+            .execution_options(synchronize_session=False)
+        )
+        # Keep the loaded instance in sync without marking it dirty
+        set_committed_value(tenant, "billing_config", {**(tenant.billing_config or {}), **patch})
+    
+    async def _get_tenant_and_admin_by_customer(
+        self,
+        customer_id: str,
+    ) -> Tuple[Optional[Tenant], Optional[User]]:
+        """
+        Resolve a tenant and its admin user from a Stripe customer ID
+        in a single round-trip (backed by ix_tenant_stripe_customer).
+        """
+        result = await self.db.execute(
+            _TENANT_ADMIN_BY_CUSTOMER, {"customer_id": customer_id}
+        )
+        row = result.first()
+        if row is None:
+            return None, None
+        return row[0], row[1]
+    
     def _get_plan_addons(self, plan: str) -> Dict[str, bool]:
-        """Get addons configuration for a plan."""
-        addons = {
-            "self_service": True,  # Core feature: QR self-ordering enabled for ALL plans
-            "kds_pro": False,
-            "analytics_ai": False,
-            "multi_branch": False,
-            "inventory": False,
-            "catering": False,
-            "loyalty": False,
-            "reservations": False,
-            "promotions": False,
-            "admin_access": False,
-        }
-        
-        if plan == "starter":
-            addons["inventory"] = True
-        elif plan == "professional":
-            addons.update({
-                "self_service": True,
-                "kds_pro": True,
-                "inventory": True,
-                "catering": True,
-                "loyalty": True,
-                "reservations": True,
-            })
-        elif plan == "enterprise":
-            addons.update({
-                "self_service": True,
-                "kds_pro": True,
-                "analytics_ai": True,
-                "multi_branch": True,
-                "inventory": True,
-                "catering": True,
-                "loyalty": True,
-                "reservations": True,
-                "promotions": True,
-                "admin_access": True,
-            })
-        
-        return addons
+        """Get addons configuration for a plan (unknown plans get no extras)."""
+        return dict(_PLAN_ADDONS.get(plan, _BASE_ADDONS))
     
     async def _send_welcome_email(
         self,
@@ -1,13 +1,19 @@
 
+from bisect import bisect_left
 from datetime import datetime, timedelta
 from typing import List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, not_
+from sqlalchemy import select, and_, or_, not_, func, cast, union_all
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 
 from app.models.models import (
-    Reservation, Table, ReservationStatus, ReservationPaymentStatus
+    Reservation, ReservationStatus, ReservationPaymentStatus
 )
+from app.services import table_cache
+
+# Reservation states that block a table
+_ACTIVE_STATUSES = (ReservationStatus.CONFIRMED, ReservationStatus.SEATED)
 
 class ReservationService:
     def __init__(self, db: AsyncSession, tenant_id: UUID):
@@ -19,74 +25,77 @@ class ReservationService:
         party_size: int, 
         desired_time: datetime,
         duration_minutes: int = 120
-    ) -> List[List[Table]]:
+    ) -> List[List[table_cache.TableRow]]:
         """
         Finds single tables or combinations of adjacent tables that fit the party size.
         Returns a list of table combinations (e.g. [[T1], [T2, T3]]).
         """
-        # 1. Get all tables for tenant
-        all_tables_res = await self.db.execute(
-            select(Table).where(Table.tenant_id == self.tenant_id)
-        )
-        all_tables = all_tables_res.scalars().all()
+        # 1. Table layout comes from the per-tenant cache
+        layout = await table_cache.get_layout(self.db, self.tenant_id)
         
-        # 2. Identify occupied tables in the time slot
+        # Overlap check: (StartA < EndB) and (EndA > StartB), with both
+        # bounds expressed on reservation_time so the range stays sargable
         end_time = desired_time + timedelta(minutes=duration_minutes)
+        window_start = desired_time - timedelta(minutes=duration_minutes)
         
-        # Overlap check: (StartA < EndB) and (EndA > StartB)
-        occupied_query = select(Reservation).where(
+        overlapping = and_(
             Reservation.tenant_id == self.tenant_id,
-            Reservation.status.in_([ReservationStatus.CONFIRMED, ReservationStatus.SEATED]),
+            Reservation.status.in_(_ACTIVE_STATUSES),
             Reservation.reservation_time < end_time,
-            func.timezone('UTC', Reservation.reservation_time) + timedelta(minutes=duration_minutes) > desired_time
+            Reservation.reservation_time > window_start
         )
         
-        occupied_res = await self.db.execute(occupied_query)
-        occupied_reservations = occupied_res.scalars().all()
+        # 2. Occupied tables: main table plus any merged (additional) tables
+        occupied = union_all(
+            select(Reservation.table_id.label("table_id")).where(
+                overlapping,
+                Reservation.table_id.isnot(None)
+            ),
+            select(
+                cast(
+                    func.jsonb_array_elements_text(Reservation.additional_table_ids),
+                    PG_UUID(as_uuid=True)
+                ).label("table_id")
+            ).where(
+                overlapping,
+                func.jsonb_typeof(Reservation.additional_table_ids) == "array"
+            )
+        ).cte("occupied")
         
-        occupied_table_ids = set()
-        for res in occupied_reservations:
-            if res.table_id:
-                occupied_table_ids.add(res.table_id)
-            if res.additional_table_ids:
-                for tid in res.additional_table_ids:
-                    # JSONB might return string UUIDs
-                    occupied_table_ids.add(UUID(tid) if isinstance(tid, str) else tid)
-
-        free_tables = [t for t in all_tables if t.id not in occupied_table_ids]
+        occupied_res = await self.db.execute(select(occupied.c.table_id).distinct())
+        occupied_ids = set(occupied_res.scalars().all())
+        free_tables = [t for t in layout.tables if t.id not in occupied_ids]
         
-        valid_combinations = []
-
-        # 3. Check single tables
-        for t in free_tables:
-            if t.capacity >= party_size:
-                valid_combinations.append([t])
+        # 3. Check single tables: bisect the capacity-sorted layout to the
+        # first table that fits (smallest fitting tables come first)
+        start = bisect_left(layout.capacities, party_size)
+        valid_combinations = [
+            [t] for t in layout.by_capacity[start:] if t.id not in occupied_ids
+        ]
         
         # 4. Check Pair Combinations (Merging)
-        # Build adjacency map
-        table_map = {t.id: t for t in free_tables}
-        
-        seen_pairs = set()
+        # Bitset adjacency over free-table indices: bit j of adj[i] means
+        # tables i and j are adjacent (symmetrised, so one-sided links count)
+        index = {t.id: i for i, t in enumerate(free_tables)}
+        adj = [0] * len(free_tables)
+        for i, t in enumerate(free_tables):
+            for neighbor_id in t.adj_uuids:
+                j = index.get(neighbor_id)
+                if j is not None and j != i: # Neighbor is also free
+                    adj[i] |= 1 << j
+                    adj[j] |= 1 << i
         
-        for t in free_tables:
-            if not t.adjacent_table_ids:
-                continue
-                
-            for neighbor_id_str in t.adjacent_table_ids:
-                neighbor_id = UUID(neighbor_id_str) if isinstance(neighbor_id_str, str) else neighbor_id_str
-                
-                if neighbor_id in table_map: # Neighbor is also free
-                    neighbor = table_map[neighbor_id]
-                    
-                    # Create unique pair key to avoid duplicates [A,B] vs [B,A]
-                    pair_key = tuple(sorted([t.id, neighbor.id]))
-                    if pair_key in seen_pairs:
-                        continue
-                    seen_pairs.add(pair_key)
-                    
-                    combined_capacity = t.capacity + neighbor.capacity
-                    if combined_capacity >= party_size:
-                        valid_combinations.append([t, neighbor])
+        capacities = [t.capacity for t in free_tables]
+        for i, t in enumerate(free_tables):
+            # Only neighbours with a higher index: each pair is visited once
+            m = adj[i] >> (i + 1)
+            base = i + 1
+            while m:
+                low = m & -m
+                j = base + low.bit_length() - 1
+                if capacities[i] + capacities[j] >= party_size:
+                    valid_combinations.append([t, free_tables[j]])
+                m ^= low
 
         return valid_combinations
 
@@ -107,7 +116,7 @@ class ReservationService:
             
         # Strategy: Pick the "Best Fit" (smallest capacity that fits) to save large tables? 
         # Or just pick the first one? For MVP, picking the first valid option.
-        selected_tables = options[0] # List[Table]
+        selected_tables = options[0] # List[TableRow]
         
         main_table = selected_tables[0]
         additional_ids = [str(t.id) for t in selected_tables[1:]]
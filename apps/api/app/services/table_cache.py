@@ -0,0 +1,116 @@
+"""
+RestoNext MX - Table Cache
+In-process TTL cache of each tenant's table layout.
+
+Table rows (capacity, adjacency) change at CRUD frequency while
+availability is probed at reservation frequency, so the layout is
+cached per tenant and dropped on every table mutation.
+
+The cache lives in each worker process: invalidate() only clears the
+current worker, so other workers/instances can serve a stale layout for
+up to the TTL (60s).
+"""
+
+from typing import NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Table, TableStatus
+
+# Key: (tenant_id, id(engine)) - the engine guard keeps test/alt databases apart
+TableKey = Tuple[UUID, int]
+
+
+class TableRow(NamedTuple):
+    """Immutable snapshot of the Table columns availability needs."""
+    id: UUID
+    number: int
+    capacity: int
+    status: Optional[TableStatus]
+    pos_x: int
+    pos_y: int
+    adjacent_table_ids: Tuple[str, ...]
+    adj_uuids: Tuple[UUID, ...]  # parsed adjacency, invalid entries skipped
+
+
+class TableLayout(NamedTuple):
+    """A tenant's tables plus a capacity-sorted view for bisecting."""
+    tables: Tuple[TableRow, ...]
+    by_capacity: Tuple[TableRow, ...]   # ascending capacity
+    capacities: Tuple[int, ...]         # parallel to by_capacity
+
+
+def _parse_adjacency(value) -> Tuple[UUID, ...]:
+    """Parse adjacent_table_ids, skipping entries that are not UUIDs."""
+    # The column is free-form JSON, so one bad entry must not fail the load
+    parsed = []
+    for v in value or ():
+        if isinstance(v, UUID):
+            parsed.append(v)
+            continue
+        try:
+            parsed.append(UUID(str(v)))
+        except ValueError:
+            continue
+    return tuple(parsed)
+
+
+_cache: "TTLCache[TableKey, TableLayout]" = TTLCache(maxsize=1024, ttl=60)
+
+
+async def get_layout(db: AsyncSession, tenant_id: UUID) -> TableLayout:
+    """
+    Return the cached table layout for a tenant, loading it on a miss.
+
+    The layout holds plain column rows rather than ORM instances, so it
+    never touches the caller's identity map and is safe to share across
+    concurrent requests.
+    """
+    key = (tenant_id, id(db.bind))
+    layout = _cache.get(key)
+    if layout is not None:
+        return layout
+
+    result = await db.execute(
+        select(
+            Table.id, Table.number, Table.capacity, Table.status,
+            Table.pos_x, Table.pos_y, Table.adjacent_table_ids,
+        ).where(Table.tenant_id == tenant_id)
+    )
+    tables = tuple(
+        TableRow(
+            id=id_,
+            number=number,
+            capacity=capacity,
+            status=status,
+            pos_x=pos_x,
+            pos_y=pos_y,
+            adjacent_table_ids=tuple(adjacency or ()),
+            adj_uuids=_parse_adjacency(adjacency),
+        )
+        for id_, number, capacity, status, pos_x, pos_y, adjacency in result
+    )
+
+    by_capacity = tuple(sorted(tables, key=lambda t: t.capacity))
+    layout = TableLayout(
+        tables=tables,
+        by_capacity=by_capacity,
+        capacities=tuple(t.capacity for t in by_capacity),
+    )
+
+    _cache[key] = layout
+    return layout
+
+
+async def get_tables(db: AsyncSession, tenant_id: UUID) -> Tuple[TableRow, ...]:
+    """Return all tables for a tenant (see get_layout)."""
+    return (await get_layout(db, tenant_id)).tables
+
+
+def invalidate(tenant_id: UUID) -> None:
+    """Drop every cached table layout for a tenant (this worker only)."""
+    for key in [k for k in list(_cache.keys()) if k[0] == tenant_id]:
+        _cache.pop(key, None)
@@ -8,18 +8,32 @@ SECURITY CONSIDERATIONS:
 3. All operations require tenant context
 """
 
+import asyncio
 import uuid
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 
-from sqlalchemy import select, and_, update
+from sqlalchemy import select, and_, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, aliased
 
 from app.models.models import (
     Table, TableStatus, Order, OrderStatus, ServiceRequest, ServiceRequestStatus
 )
 from app.core.websocket_manager import ws_manager
+from app.services import table_cache
+
+
+# Server-side UTC timestamp for naive DateTime columns (matches utcnow())
+_UTC_NOW = func.timezone("utc", func.now())
+
+# Orders still open on a table when its session is closed
+_CLOSABLE_ORDER_STATUSES = (
+    OrderStatus.OPEN,
+    OrderStatus.IN_PROGRESS,
+    OrderStatus.READY,
+    OrderStatus.DELIVERED,
+)
 
 
 class TableService:
@@ -56,26 +70,29 @@ class TableService:
         Raises:
             ValueError: If table not found or tenant mismatch
         """
-        # Build query with optional tenant filter
-        query = select(Table).where(Table.id == table_id)
+        # Single UPDATE ... FROM ... RETURNING: the self-join exposes the
+        # pre-update token, so no prior SELECT or post-commit refresh is needed
+        previous = aliased(Table)
+        
+        stmt = (
+            update(Table)
+            .where(Table.id == table_id, previous.id == Table.id)
+            .values(qr_secret_token=uuid.uuid4(), qr_token_generated_at=_UTC_NOW)
+            .returning(Table, previous.qr_secret_token)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
         if tenant_id:
-            query = query.where(Table.tenant_id == tenant_id)
+            stmt = stmt.where(Table.tenant_id == tenant_id)
         
-        result = await self.db.execute(query)
-        table = result.scalar_one_or_none()
+        row = (await self.db.execute(stmt)).one_or_none()
         
-        if not table:
+        if row is None:
             raise ValueError(f"Table {table_id} not found")
         
-        # Generate new token
-        old_token = table.qr_secret_token
-        new_token = uuid.uuid4()
-        
-        table.qr_secret_token = new_token
-        table.qr_token_generated_at = datetime.utcnow()
+        table, old_token = row
         
         await self.db.commit()
-        await self.db.refresh(table)
+        table_cache.invalidate(table.tenant_id)
         
         # Notify WebSocket clients that token was rotated
         # This allows any connected tablets to show "session expired" message
@@ -85,7 +102,7 @@ class TableService:
                 "table_id": str(table_id),
                 "table_number": table.number,
                 "old_token_prefix": str(old_token)[:8],  # Only first 8 chars for logging
-                "rotated_at": datetime.utcnow().isoformat()
+                "rotated_at": table.qr_token_generated_at.isoformat()
             }
         }, "waiter")
         
@@ -117,150 +134,166 @@ class TableService:
         Returns:
             Dict with summary of operations performed
         """
+        # One timestamp for the whole closure (summary + socket payload);
+        # DB columns are stamped server-side via _UTC_NOW
+        iso_now = datetime.utcnow().isoformat()
+        table_id_str = str(table_id)
+        
         result_summary = {
-            "table_id": str(table_id),
-            "timestamp": datetime.utcnow().isoformat(),
+            "table_id": table_id_str,
+            "timestamp": iso_now,
             "operations": []
         }
         
-        # Fetch table with validation
-        table_result = await self.db.execute(
-            select(Table).where(
+        # Free the table and rotate its token (security - invalidates old QR)
+        # in one UPDATE ... RETURNING; the self-join exposes the old status
+        previous = aliased(Table)
+        table_row = (await self.db.execute(
+            update(Table)
+            .where(
                 and_(
                     Table.id == table_id,
-                    Table.tenant_id == tenant_id
+                    Table.tenant_id == tenant_id,
+                    previous.id == Table.id
                 )
             )
-        )
-        table = table_result.scalar_one_or_none()
+            .values(
+                status=TableStatus.FREE,
+                qr_secret_token=uuid.uuid4(),
+                qr_token_generated_at=_UTC_NOW
+            )
+            .returning(Table, previous.status)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )).one_or_none()
         
-        if not table:
+        if table_row is None:
             raise ValueError(f"Table {table_id} not found for tenant {tenant_id}")
         
-        # 1. Close any open orders for this table
+        table, old_status = table_row
+        
+        # 1. Close any open orders for this table (single bulk UPDATE)
         if close_orders:
             orders_result = await self.db.execute(
-                select(Order).where(
+                update(Order)
+                .where(
                     and_(
                         Order.table_id == table_id,
-                        Order.status.in_([
-                            OrderStatus.OPEN, 
-                            OrderStatus.IN_PROGRESS, 
-                            OrderStatus.READY,
-                            OrderStatus.DELIVERED
-                        ])
+                        Order.status.in_(_CLOSABLE_ORDER_STATUSES)
                     )
                 )
+                .values(status=OrderStatus.PAID, updated_at=_UTC_NOW)
+                .returning(Order.id)
+                .execution_options(synchronize_session=False)
             )
-            orders = orders_result.scalars().all()
-            
-            for order in orders:
-                order.status = OrderStatus.PAID
-                order.updated_at = datetime.utcnow()
+            order_ids = orders_result.scalars().all()
             
             result_summary["operations"].append({
                 "action": "orders_closed",
-                "count": len(orders),
-                "order_ids": [str(o.id) for o in orders]
+                "count": len(order_ids),
+                "order_ids": [str(order_id) for order_id in order_ids]
             })
         
-        # 2. Resolve pending service requests
+        # 2. Resolve pending service requests (single bulk UPDATE)
         requests_result = await self.db.execute(
-            select(ServiceRequest).where(
+            update(ServiceRequest)
+            .where(
                 and_(
                     ServiceRequest.table_id == table_id,
                     ServiceRequest.status != ServiceRequestStatus.RESOLVED
                 )
             )
+            .values(status=ServiceRequestStatus.RESOLVED)
+            .execution_options(synchronize_session=False)
         )
-        requests = requests_result.scalars().all()
-        
-        for req in requests:
-            req.status = ServiceRequestStatus.RESOLVED
         
         result_summary["operations"].append({
             "action": "service_requests_resolved",
-            "count": len(requests)
+            "count": requests_result.rowcount
         })
         
-        # 3. Change table status to free
-        old_status = table.status
-        table.status = TableStatus.FREE
-        
+        # 3. Table status changed to free (applied above)
         result_summary["operations"].append({
             "action": "status_changed",
             "from": old_status.value,
             "to": TableStatus.FREE.value
         })
         
-        # 4. Rotate token (security - invalidates old QR)
-        old_token = table.qr_secret_token
-        table.qr_secret_token = uuid.uuid4()
-        table.qr_token_generated_at = datetime.utcnow()
-        
+        # 4. Token rotated (applied above)
         result_summary["operations"].append({
             "action": "token_rotated",
             "new_token_prefix": str(table.qr_secret_token)[:8]
         })
         
         await self.db.commit()
+        table_cache.invalidate(tenant_id)
         
         # 5. WebSocket notifications
         if notify_sockets:
-            # Notify POS/Waiter that table is now free
-            await ws_manager.broadcast_to_channel({
-                "event": "table:session_closed",
-                "payload": {
-                    "table_id": str(table_id),
-                    "table_number": table.number,
-                    "status": "free",
-                    "closed_at": datetime.utcnow().isoformat()
-                }
-            }, "waiter")
-            
-            # Special broadcast for any tablet connected to this table
-            # This triggers the "session expired" screen
-            await ws_manager.broadcast_to_channel({
-                "event": "table:cleared",
-                "payload": {
-                    "table_id": str(table_id),
-                    "message": "Tu sesión ha terminado. ¡Gracias por tu visita!"
-                }
-            }, f"table:{table_id}")
+            await asyncio.gather(
+                # Notify POS/Waiter that table is now free
+                ws_manager.broadcast_to_channel({
+                    "event": "table:session_closed",
+                    "payload": {
+                        "table_id": table_id_str,
+                        "table_number": table.number,
+                        "status": "free",
+                        "closed_at": iso_now
+                    }
+                }, "waiter"),
+                # Special broadcast for any tablet connected to this table
+                # This triggers the "session expired" screen
+                ws_manager.broadcast_to_channel({
+                    "event": "table:cleared",
+                    "payload": {
+                        "table_id": table_id_str,
+                        "message": "Tu sesión ha terminado. ¡Gracias por tu visita!"
+                    }
+                }, f"table:{table_id}"),
+            )
         
         return result_summary
     
     async def get_all_tables_with_qr_info(
         self,
         tenant_id: uuid.UUID
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Get all tables with QR code generation info for admin panel.
+        Stream all tables with QR code generation info for admin panel.
         
-        Returns list of tables with:
+        Async generator over a server-side cursor, so memory stays bounded
+        by one row. Yields dicts with:
         - Basic info (id, number, capacity, status)
         - QR token info (token, generated_at)
         - Self-service status
         """
-        result = await self.db.execute(
-            select(Table)
+        # Column projection: plain rows, no ORM hydration / identity map
+        result = await self.db.stream(
+            select(
+                Table.id,
+                Table.number,
+                Table.capacity,
+                Table.status,
+                Table.qr_secret_token,
+                Table.qr_token_generated_at,
+                Table.self_service_enabled,
+            )
             .where(Table.tenant_id == tenant_id)
             .order_by(Table.number)
         )
-        tables = result.scalars().all()
         
-        return [
-            {
-                "id": str(t.id),
-                "number": t.number,
-                "capacity": t.capacity,
-                "status": t.status.value,
-                "qr_secret_token": str(t.qr_secret_token),
-                "qr_token_generated_at": t.qr_token_generated_at.isoformat() if t.qr_token_generated_at else None,
-                "self_service_enabled": t.self_service_enabled
+        async for (
+            table_id, number, capacity, table_status,
+            token, generated_at, self_service_enabled
+        ) in result:
+            yield {
+                "id": str(table_id),
+                "number": number,
+                "capacity": capacity,
+                "status": table_status.value,
+                "qr_secret_token": str(token),
+                "qr_token_generated_at": generated_at.isoformat() if generated_at else None,
+                "self_service_enabled": self_service_enabled
             }
-            for t in tables
-        ]
     
     async def toggle_self_service(
         self,
@@ -280,21 +313,24 @@ class TableService:
             Updated Table
         """
         result = await self.db.execute(
-            select(Table).where(
+            update(Table)
+            .where(
                 and_(
                     Table.id == table_id,
                     Table.tenant_id == tenant_id
                 )
             )
+            .values(self_service_enabled=enabled)
+            .returning(Table)
+            .execution_options(populate_existing=True, synchronize_session=False)
         )
         table = result.scalar_one_or_none()
         
         if not table:
             raise ValueError(f"Table {table_id} not found")
         
-        table.self_service_enabled = enabled
         await self.db.commit()
-        await self.db.refresh(table)
+        table_cache.invalidate(tenant_id)
         
         return table
 
@@ -5,6 +5,21 @@ class UnitConversionError(ValueError):
     """Raised when unit conversion is not possible"""
     pass
 
+# (larger unit, smaller unit) -> factor; the reverse direction divides
+_SCALE_UP = {
+    (UnitOfMeasure.KG, UnitOfMeasure.G): 1000.0,
+    (UnitOfMeasure.LT, UnitOfMeasure.ML): 1000.0,
+}
+
+_UNIT_TYPE = {
+    UnitOfMeasure.KG: 'weight',
+    UnitOfMeasure.G: 'weight',
+    UnitOfMeasure.LT: 'volume',
+    UnitOfMeasure.ML: 'volume',
+    UnitOfMeasure.PZA: 'other',
+    UnitOfMeasure.PORCION: 'other',
+}
+
 def convert_unit(quantity: float, from_unit: Union[str, UnitOfMeasure], to_unit: Union[str, UnitOfMeasure]) -> float:
     """
     Convert a quantity from one unit to another.
@@ -25,47 +40,27 @@ def convert_unit(quantity: float, from_unit: Union[str, UnitOfMeasure], to_unit:
     Raises:
         UnitConversionError: If units are incompatible
     """
-    # Normalize units to string
-    src = from_unit.value if isinstance(from_unit, UnitOfMeasure) else from_unit
-    dst = to_unit.value if isinstance(to_unit, UnitOfMeasure) else to_unit
-    
-    # If units are the same, no conversion needed
-    if src == dst:
+    # UnitOfMeasure is a str enum, so members and raw strings hash alike
+    # and both hit the same dict entries without unwrapping .value
+    if from_unit == to_unit:
         return quantity
-        
-    # Weight conversions
-    if src == UnitOfMeasure.KG.value and dst == UnitOfMeasure.G.value:
-        return quantity * 1000.0
-    if src == UnitOfMeasure.G.value and dst == UnitOfMeasure.KG.value:
-        return quantity / 1000.0
-        
-    # Volume conversions
-    if src == UnitOfMeasure.LT.value and dst == UnitOfMeasure.ML.value:
-        return quantity * 1000.0
-    if src == UnitOfMeasure.ML.value and dst == UnitOfMeasure.LT.value:
-        return quantity / 1000.0
-        
-    # Check for incompatible types
-    # Group units by type
-    weight_units = {UnitOfMeasure.KG.value, UnitOfMeasure.G.value}
-    volume_units = {UnitOfMeasure.LT.value, UnitOfMeasure.ML.value}
-    other_units = {UnitOfMeasure.PZA.value, UnitOfMeasure.PORCION.value}
     
-    src_type = None
-    if src in weight_units: src_type = 'weight'
-    elif src in volume_units: src_type = 'volume'
-    elif src in other_units: src_type = 'other'
+    factor = _SCALE_UP.get((from_unit, to_unit))
+    if factor is not None:
+        return quantity * factor
+    factor = _SCALE_UP.get((to_unit, from_unit))
+    if factor is not None:
+        return quantity / factor
     
-    dst_type = None
-    if dst in weight_units: dst_type = 'weight'
-    elif dst in volume_units: dst_type = 'volume'
-    elif dst in other_units: dst_type = 'other'
+    # Cold path: build a readable error
+    src = from_unit.value if isinstance(from_unit, UnitOfMeasure) else from_unit
+    dst = to_unit.value if isinstance(to_unit, UnitOfMeasure) else to_unit
+    src_type = _UNIT_TYPE.get(src)
+    dst_type = _UNIT_TYPE.get(dst)
     
     if src_type != dst_type:
         raise UnitConversionError(f"Cannot convert between {src} ({src_type}) and {dst} ({dst_type})")
         
-    # If we get here, valid type but implementation missing? 
-    # Or maybe it's PZA <-> PZA which is handled by src == dst check.
-    # What about PZA <-> PORCION? Usually not convertible without more context.
-    
+    # Same type but no factor (e.g. PZA <-> PORCION): not convertible
+    # without more context.
     raise UnitConversionError(f"Conversion from {src} to {dst} is not supported")
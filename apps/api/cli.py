@@ -17,14 +17,21 @@ Author: RestoNext Team
 """
 
 import asyncio
+import copy
+import enum
+import json
+import os
+import random
 import sys
 import re
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from secrets import token_hex
+from types import MappingProxyType
+from typing import NamedTuple, Optional
 from uuid import uuid4
 
 import typer
-from rich.console import Console
+from rich.console import Console, Group
 from rich.table import Table
 from rich.panel import Panel
 from rich import print as rprint
@@ -32,12 +39,10 @@ from rich import print as rprint
 # Add app to path for imports
 sys.path.insert(0, ".")
 
-from app.core.database import async_session_maker, init_db
-from app.core.security import get_password_hash
-from app.models.models import (
-    Tenant, User, UserRole, Table, TableStatus,
-    Ingredient, UnitOfMeasure
-)
+# NOTE: app.* (ORM models, database engine, password hasher) is imported
+# inside the commands that need it, so light commands such as `version`
+# and `scheduler-status` start without loading SQLAlchemy or bcrypt.
+# The ORM Table is imported as TableModel to keep rich's Table usable.
 
 # Initialize Typer app
 app = typer.Typer(
@@ -46,12 +51,26 @@ app = typer.Typer(
     add_completion=False
 )
 
-console = Console()
+class _LazyConsole:
+    """Builds the Rich Console (terminal/colour probing) on first use."""
+    
+    _console: Optional[Console] = None
+    
+    def __getattr__(self, name):
+        if _LazyConsole._console is None:
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+
+
+console = _LazyConsole()
+
+# Baked in at image build time; falls back to the import date for local runs
+BUILD_DATE = os.environ.get("RESTONEXT_BUILD_DATE") or datetime.now().strftime('%Y-%m-%d')
 
 # ============================================
 # Plan Configurations
 # ============================================
-PLAN_CONFIGS = {
+_PLAN_CONFIG_DATA = {
     "starter": {
         "description": "Para restaurantes pequeños",
         "max_tables": 10,
@@ -71,27 +90,62 @@ PLAN_CONFIGS = {
         "features": {"self_service": {"allow_bill_request": True, "require_deposit": False}}
     }
 }
+# Read-only views: the plan templates are shared by every command
+PLAN_CONFIGS = MappingProxyType({k: MappingProxyType(v) for k, v in _PLAN_CONFIG_DATA.items()})
+_PLAN_NAMES = frozenset(PLAN_CONFIGS)
+
+# Basic Ingredients (Common for Mexican restaurants)
+# Constant part of each insert row; "unit" holds UnitOfMeasure values
+BASE_INGREDIENTS = tuple(
+    {
+        "name": name,
+        "unit": unit,
+        "stock_quantity": stock,
+        "min_stock_alert": min_stock,
+        "cost_per_unit": cost,
+        "is_active": True,
+    }
+    for name, unit, stock, min_stock, cost in (
+        ("Carne de Res", "kg", 10.0, 2.0, 180.0),
+        ("Pollo", "kg", 8.0, 2.0, 95.0),
+        ("Tortilla de Maíz", "pza", 500.0, 100.0, 1.50),
+        ("Queso Oaxaca", "kg", 5.0, 1.0, 120.0),
+        ("Cebolla", "kg", 10.0, 2.0, 25.0),
+        ("Tomate", "kg", 10.0, 2.0, 35.0),
+        ("Aceite", "lt", 20.0, 5.0, 45.0),
+        ("Sal", "kg", 5.0, 1.0, 15.0),
+    )
+)
 
 
 # ============================================
 # Helper Functions
 # ============================================
 
+# Slug normalization tables, built once at import
+_SLUG_ACCENTS = str.maketrans({
+    **dict.fromkeys('áàäâã', 'a'),
+    **dict.fromkeys('éèëê', 'e'),
+    **dict.fromkeys('íìïî', 'i'),
+    **dict.fromkeys('óòöôõ', 'o'),
+    **dict.fromkeys('úùüû', 'u'),
+    'ñ': 'n',
+})
+_SLUG_NON_ALNUM = re.compile(r'[^a-z0-9\s-]')
+_SLUG_SEPARATORS = re.compile(r'[\s_-]+')
+
+
 def generate_slug(name: str) -> str:
     """Generate a URL-friendly slug from name."""
-    slug = name.lower().strip()
-    slug = re.sub(r'[áàäâã]', 'a', slug)
-    slug = re.sub(r'[éèëê]', 'e', slug)
-    slug = re.sub(r'[íìïî]', 'i', slug)
-    slug = re.sub(r'[óòöôõ]', 'o', slug)
-    slug = re.sub(r'[úùüû]', 'u', slug)
-    slug = re.sub(r'[ñ]', 'n', slug)
-    slug = re.sub(r'[^a-z0-9\s-]', '', slug)
-    slug = re.sub(r'[\s_]+', '-', slug)
-    slug = re.sub(r'-+', '-', slug)
-    slug = slug.strip('-')
+    slug = name.lower().strip().translate(_SLUG_ACCENTS)
+    slug = _SLUG_NON_ALNUM.sub('', slug)
+    slug = _SLUG_SEPARATORS.sub('-', slug).strip('-')
     # Add random suffix for uniqueness
-    return f"{slug}-{str(uuid4())[:6]}"
+    return f"{slug}-{uuid4().hex[:6]}"
+
+
+_EMAIL_SERVICE_UNPROBED = object()
+_cached_email_service = _EMAIL_SERVICE_UNPROBED
 
 
 async def _send_welcome_email(
@@ -102,19 +156,26 @@ async def _send_welcome_email(
     password: str
 ) -> bool:
     """Send welcome email with credentials to new tenant admin."""
-    try:
-        from app.services.email_service import get_email_service
-        email_service = get_email_service()
-        return await email_service.send_welcome_email(
-            to_email=to_email,
-            tenant_name=tenant_name,
-            admin_name=admin_name,
-            email=email,
-            password=password
-        )
-    except ImportError:
+    global _cached_email_service
+    if _cached_email_service is _EMAIL_SERVICE_UNPROBED:
+        # Probe once per process; failed imports are not cached by Python
+        try:
+            from app.services.email_service import get_email_service
+            _cached_email_service = get_email_service()
+        except ImportError:
+            _cached_email_service = None
+    
+    if _cached_email_service is None:
         console.print("[yellow]Email service not available[/yellow]")
         return False
+    
+    return await _cached_email_service.send_welcome_email(
+        to_email=to_email,
+        tenant_name=tenant_name,
+        admin_name=admin_name,
+        email=email,
+        password=password
+    )
 
 
 async def _create_tenant_async(
@@ -127,116 +188,121 @@ async def _create_tenant_async(
     phone: Optional[str]
 ) -> dict:
     """Async implementation of tenant creation."""
+    from sqlalchemy import insert
+    from app.core.database import async_session_maker
+    from app.core.security import get_password_hash, make_unusable_password
+    from app.models.models import (
+        Tenant, User, UserRole, Table as TableModel, TableStatus, Ingredient
+    )
     
-    if plan not in PLAN_CONFIGS:
-        raise ValueError(f"Invalid plan: {plan}. Must be one of: {', '.join(PLAN_CONFIGS.keys())}")
+    plan_config = PLAN_CONFIGS.get(plan)
+    if plan_config is None:
+        raise ValueError(f"Invalid plan: {plan}. Must be one of: {', '.join(PLAN_CONFIGS)}")
     
-    plan_config = PLAN_CONFIGS[plan]
+    # Hash the admin password on a worker thread before checking out a
+    # connection, so the pool slot is held for database I/O only; the
+    # system user never logs in, so it gets an unusable marker instead
+    # of a second bcrypt run
+    admin_hash = await asyncio.to_thread(get_password_hash, password)
     
-    async with async_session_maker() as db:
-        try:
-            # Create Tenant
-            tenant = Tenant(
-                id=uuid4(),
-                name=name,
-                slug=generate_slug(name),
-                legal_name=name,
-                trade_name=name,
-                rfc=rfc,
-                contacts={"email": email, "phone": phone or ""},
-                active_addons=plan_config["addons"],
-                features_config=plan_config["features"],
-                onboarding_complete=False,
-                onboarding_step="basic",
-                is_active=True,
-                timezone="America/Mexico_City",
-                currency="MXN",
-                locale="es-MX"
-            )
-            db.add(tenant)
-            await db.flush()  # Get tenant ID
-            
-            # Create Admin User
-            admin_user = User(
-                id=uuid4(),
-                tenant_id=tenant.id,
-                email=email,
-                hashed_password=get_password_hash(password),
-                name=admin_name,
-                role=UserRole.ADMIN,
-                is_active=True
-            )
-            db.add(admin_user)
-            
-            # Create System User (for automated operations)
-            system_user = User(
-                id=uuid4(),
-                tenant_id=tenant.id,
-                email=f"system@{tenant.slug}.local",
-                hashed_password=get_password_hash(str(uuid4())),  # Random password
-                name="Sistema",
-                role=UserRole.ADMIN,
-                is_active=True
-            )
-            db.add(system_user)
-            await db.flush()
-            
-            # Create Default Tables
-            max_tables = min(plan_config["max_tables"], 10)  # Start with first 10
-            for i in range(1, max_tables + 1):
-                table = Table(
-                    id=uuid4(),
-                    tenant_id=tenant.id,
-                    number=i,
-                    capacity=4,
-                    status=TableStatus.FREE,
-                    pos_x=(i - 1) % 5,
-                    pos_y=(i - 1) // 5,
-                    self_service_enabled=plan_config["addons"].get("self_service", False)
-                )
-                db.add(table)
-            
-            # Create Basic Ingredients (Common for Mexican restaurants)
-            base_ingredients = [
-                ("Carne de Res", UnitOfMeasure.KG, 10.0, 2.0, 180.0),
-                ("Pollo", UnitOfMeasure.KG, 8.0, 2.0, 95.0),
-                ("Tortilla de Maíz", UnitOfMeasure.PZA, 500.0, 100.0, 1.50),
-                ("Queso Oaxaca", UnitOfMeasure.KG, 5.0, 1.0, 120.0),
-                ("Cebolla", UnitOfMeasure.KG, 10.0, 2.0, 25.0),
-                ("Tomate", UnitOfMeasure.KG, 10.0, 2.0, 35.0),
-                ("Aceite", UnitOfMeasure.LT, 20.0, 5.0, 45.0),
-                ("Sal", UnitOfMeasure.KG, 5.0, 1.0, 15.0),
-            ]
-            
-            for ing_name, unit, stock, min_stock, cost in base_ingredients:
-                ingredient = Ingredient(
-                    id=uuid4(),
-                    tenant_id=tenant.id,
-                    name=ing_name,
-                    sku=f"ING-{str(uuid4())[:8].upper()}",
-                    unit=unit,
-                    stock_quantity=stock,
-                    min_stock_alert=min_stock,
-                    cost_per_unit=cost,
-                    is_active=True
-                )
-                db.add(ingredient)
-            
-            await db.commit()
-            
-            return {
-                "tenant_id": str(tenant.id),
-                "tenant_slug": tenant.slug,
-                "admin_user_id": str(admin_user.id),
-                "admin_email": email,
-                "plan": plan,
-                "tables_created": max_tables,
-                "ingredients_created": len(base_ingredients)
+    # Single transaction: commits on exit, rolls back on error. Autoflush
+    # is off: only the tenant row must exist before the bulk inserts (FK),
+    # and it is flushed explicitly; the users go out with the final flush
+    async with async_session_maker(autoflush=False) as db, db.begin():
+        # Create Tenant
+        tenant = Tenant(
+            id=uuid4(),
+            name=name,
+            slug=generate_slug(name),
+            legal_name=name,
+            trade_name=name,
+            rfc=rfc,
+            contacts={"email": email, "phone": phone or ""},
+            # Copies, so the tenant never aliases the shared plan template
+            active_addons=dict(plan_config["addons"]),
+            features_config=copy.deepcopy(plan_config["features"]),
+            onboarding_complete=False,
+            onboarding_step="basic",
+            is_active=True,
+            timezone="America/Mexico_City",
+            currency="MXN",
+            locale="es-MX"
+        )
+        db.add(tenant)
+        await db.flush()
+        
+        # Create Admin User
+        admin_user = User(
+            id=uuid4(),
+            tenant_id=tenant.id,
+            email=email,
+            hashed_password=admin_hash,
+            name=admin_name,
+            role=UserRole.ADMIN,
+            is_active=True
+        )
+        db.add(admin_user)
+        
+        # Create System User (for automated operations)
+        system_user = User(
+            id=uuid4(),
+            tenant_id=tenant.id,
+            email=f"system@{tenant.slug}.local",
+            hashed_password=make_unusable_password(),
+            name="Sistema",
+            role=UserRole.ADMIN,
+            is_active=True
+        )
+        db.add(system_user)
+        
+        # Every key (ids and the columns that would otherwise run a Python
+        # default per row) is filled client-side, so both inserts are plain
+        # executemany INSERTs with no RETURNING and no per-row default calls
+        created_at = datetime.utcnow()
+        
+        # Create Default Tables (single executemany INSERT)
+        max_tables = min(plan_config["max_tables"], 10)  # Start with first 10
+        self_service = plan_config["addons"].get("self_service", False)
+        table_ids = [uuid4() for _ in range(max_tables)]
+        await db.execute(insert(TableModel), [
+            {
+                "id": table_id,
+                "tenant_id": tenant.id,
+                "number": i,
+                "capacity": 4,
+                "status": TableStatus.FREE,
+                "pos_x": pos_x,
+                "pos_y": pos_y,
+                "adjacent_table_ids": [],
+                "qr_secret_token": uuid4(),
+                "qr_token_generated_at": created_at,
+                "self_service_enabled": self_service,
             }
-            
-        except Exception as e:
-            await db.rollback()
-            raise e
+            for i, table_id in enumerate(table_ids, start=1)
+            for pos_y, pos_x in (divmod(i - 1, 5),)  # 5 tables per row
+        ])
+        
+        # Create Basic Ingredients (single executemany INSERT)
+        await db.execute(insert(Ingredient), [
+            {
+                **template,
+                "id": uuid4(),
+                "tenant_id": tenant.id,
+                "sku": f"ING-{i:04d}",  # fresh tenant: a local sequence suffices
+                "created_at": created_at,
+            }
+            for i, template in enumerate(BASE_INGREDIENTS, start=1)
+        ])
+    
+    return {
+        "tenant_id": str(tenant.id),
+        "tenant_slug": tenant.slug,
+        "admin_user_id": str(admin_user.id),
+        "admin_email": email,
+        "plan": plan,
+        "tables_created": max_tables,
+        "ingredients_created": len(BASE_INGREDIENTS)
+    }
 
 
 # ============================================
@@ -265,70 +331,83 @@ def create_tenant(
     Example:
         python cli.py create-tenant --name "Tacos El Patrón" --email "admin@elpatron.mx" --plan enterprise
     """
-    console.print(Panel.fit(
+    header = Panel.fit(
         f"[bold blue]Creating new tenant:[/bold blue] [green]{name}[/green]",
         title="🍽️ RestoNext"
-    ))
+    )
     
-    if plan not in PLAN_CONFIGS:
-        console.print(f"[red]❌ Invalid plan: {plan}[/red]")
-        console.print(f"Available plans: {', '.join(PLAN_CONFIGS.keys())}")
+    if plan not in _PLAN_NAMES:
+        console.print(Group(
+            header,
+            f"[red]❌ Invalid plan: {plan}[/red]",
+            f"Available plans: {', '.join(PLAN_CONFIGS)}",
+        ))
         raise typer.Exit(1)
     
-    console.print(f"  📋 Plan: [cyan]{plan}[/cyan] - {PLAN_CONFIGS[plan]['description']}")
-    console.print(f"  📧 Email: [cyan]{email}[/cyan]")
+    console.print(Group(
+        header,
+        f"  📋 Plan: [cyan]{plan}[/cyan] - {PLAN_CONFIGS[plan]['description']}",
+        f"  📧 Email: [cyan]{email}[/cyan]",
+    ))
     
-    with console.status("[bold green]Creating tenant..."):
+    async def _run_all():
+        # One event loop (and engine) for tenant creation + welcome email
+        result = await _create_tenant_async(
+            name=name,
+            email=email,
+            plan=plan,
+            password=password,
+            admin_name=admin_name,
+            rfc=rfc,
+            phone=phone
+        )
+        
+        # Show the result first: the tenant exists whether or not SMTP works
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Property", style="cyan")
+        table.add_column("Value", style="white")
+        
+        table.add_row("Tenant ID", result["tenant_id"])
+        table.add_row("Slug", result["tenant_slug"])
+        table.add_row("Admin User ID", result["admin_user_id"])
+        table.add_row("Admin Email", result["admin_email"])
+        table.add_row("Plan", result["plan"])
+        table.add_row("Tables Created", str(result["tables_created"]))
+        table.add_row("Ingredients Created", str(result["ingredients_created"]))
+        
+        console.print(Group(
+            "\n[bold green]✅ Tenant created successfully![/bold green]\n",
+            table,
+            "\n[bold blue]📧 Sending welcome email...[/bold blue]",
+        ))
+        
+        # Send welcome email with credentials
         try:
-            result = asyncio.run(_create_tenant_async(
-                name=name,
-                email=email,
-                plan=plan,
-                password=password,
+            email_sent = await _send_welcome_email(
+                to_email=email,
+                tenant_name=name,
                 admin_name=admin_name,
-                rfc=rfc,
-                phone=phone
-            ))
-            
-            console.print("\n[bold green]✅ Tenant created successfully![/bold green]\n")
-            
-            # Display results table
-            table = Table(show_header=True, header_style="bold magenta")
-            table.add_column("Property", style="cyan")
-            table.add_column("Value", style="white")
-            
-            table.add_row("Tenant ID", result["tenant_id"])
-            table.add_row("Slug", result["tenant_slug"])
-            table.add_row("Admin User ID", result["admin_user_id"])
-            table.add_row("Admin Email", result["admin_email"])
-            table.add_row("Plan", result["plan"])
-            table.add_row("Tables Created", str(result["tables_created"]))
-            table.add_row("Ingredients Created", str(result["ingredients_created"]))
-            
-            console.print(table)
-            
-            # Send welcome email with credentials
-            console.print("\n[bold blue]📧 Sending welcome email...[/bold blue]")
-            try:
-                email_sent = asyncio.run(_send_welcome_email(
-                    to_email=email,
-                    tenant_name=name,
-                    admin_name=admin_name,
-                    email=email,
-                    password=password
-                ))
-                if email_sent:
-                    console.print("[green]✅ Welcome email sent successfully![/green]")
-                else:
-                    console.print("[yellow]⚠️ Email service disabled - credentials not sent[/yellow]")
-            except Exception as email_error:
-                console.print(f"[yellow]⚠️ Could not send email: {email_error}[/yellow]")
-            
-            console.print("\n[yellow]📝 Next steps:[/yellow]")
-            console.print(f"   1. Login at https://restonext.vercel.app/login")
-            console.print(f"   2. Complete onboarding wizard")
-            console.print(f"   3. Configure menu and prices")
-            
+                email=email,
+                password=password
+            )
+            if email_sent:
+                email_line = "[green]✅ Welcome email sent successfully![/green]"
+            else:
+                email_line = "[yellow]⚠️ Email service disabled - credentials not sent[/yellow]"
+        except Exception as email_error:
+            email_line = f"[yellow]⚠️ Could not send email: {email_error}[/yellow]"
+        
+        console.print(Group(
+            email_line,
+            "\n[yellow]📝 Next steps:[/yellow]",
+            "   1. Login at https://restonext.vercel.app/login",
+            "   2. Complete onboarding wizard",
+            "   3. Configure menu and prices",
+        ))
+    
+    with console.status("[bold green]Creating tenant..."):
+        try:
+            asyncio.run(_run_all())
         except Exception as e:
             console.print(f"\n[red]❌ Error creating tenant: {str(e)}[/red]")
             raise typer.Exit(1)
@@ -341,40 +420,49 @@ def list_tenants(
     """
     📋 List all tenants in the system.
     """
-    async def _list():
+    table = Table(show_header=True, header_style="bold magenta", title="🍽️ Tenants")
+    table.add_column("Name", style="cyan")
+    table.add_column("Slug", style="white")
+    table.add_column("Status", style="green")
+    table.add_column("Created", style="dim")
+    
+    async def _list() -> int:
         from sqlalchemy import select
+        from sqlalchemy.orm import load_only
+        from app.core.database import async_session_maker
+        from app.models.models import Tenant
         async with async_session_maker() as db:
-            query = select(Tenant)
+            # Only the rendered columns; skips the JSONB config blobs
+            query = select(Tenant).options(
+                load_only(Tenant.name, Tenant.slug, Tenant.is_active, Tenant.created_at)
+            )
             if active_only:
                 query = query.where(Tenant.is_active == True)
             query = query.order_by(Tenant.created_at.desc())
             
-            result = await db.execute(query)
-            return result.scalars().all()
+            # Stream in batches and add rows as they arrive instead of
+            # materializing every Tenant first
+            count = 0
+            result = await db.stream_scalars(query.execution_options(yield_per=500))
+            async for t in result:
+                status = "✅ Active" if t.is_active else "❌ Inactive"
+                table.add_row(
+                    t.name,
+                    t.slug,
+                    status,
+                    t.created_at.strftime("%Y-%m-%d %H:%M")
+                )
+                count += 1
+            return count
     
-    tenants = asyncio.run(_list())
+    total = asyncio.run(_list())
     
-    if not tenants:
+    if not total:
         console.print("[yellow]No tenants found.[/yellow]")
         return
     
-    table = Table(show_header=True, header_style="bold magenta", title="🍽️ Tenants")
-    table.add_column("Name", style="cyan")
-    table.add_column("Slug", style="white")
-    table.add_column("Status", style="green")
-    table.add_column("Created", style="dim")
-    
-    for t in tenants:
-        status = "✅ Active" if t.is_active else "❌ Inactive"
-        table.add_row(
-            t.name,
-            t.slug,
-            status,
-            t.created_at.strftime("%Y-%m-%d %H:%M")
-        )
-    
     console.print(table)
-    console.print(f"\n[dim]Total: {len(tenants)} tenant(s)[/dim]")
+    console.print(f"\n[dim]Total: {total} tenant(s)[/dim]")
 
 
 @app.command("run-job")
@@ -404,13 +492,15 @@ def run_job(
 
 
 @app.command("scheduler-status")
-def scheduler_status():
+def scheduler_status(
+    force: bool = typer.Option(False, "--force", help="Bypass the cached status snapshot")
+):
     """
     📊 Show scheduler status and next run times.
     """
     from app.core.scheduler import get_scheduler_status
     
-    status = get_scheduler_status()
+    status = get_scheduler_status(force=force)
     
     if not status["running"]:
         console.print("[yellow]⚠️ Scheduler is not running[/yellow]")
@@ -436,6 +526,8 @@ def init_database():
     """
     🗄️ Initialize database tables.
     """
+    from app.core.database import init_db
+    
     console.print("[bold blue]Initializing database...[/bold blue]")
     
     with console.status("[bold green]Creating tables..."):
@@ -453,7 +545,7 @@ def version():
         "[bold cyan]RestoNext MX[/bold cyan]\n"
         "Version: [green]1.0.0[/green]\n"
         "Python Restaurant Management SaaS\n\n"
-        f"[dim]Build Date: {datetime.now().strftime('%Y-%m-%d')}[/dim]",
+        f"[dim]Build Date: {BUILD_DATE}[/dim]",
         title="🍽️ About",
         border_style="cyan"
     ))
@@ -463,6 +555,118 @@ def version():
 # Demo Seeding Command
 # ============================================
 
+# Batches at least this large go through COPY instead of INSERT
+_COPY_THRESHOLD = 100
+
+# Rows per statement if the dialect renders an executemany INSERT as
+# multi-row VALUES; keeps any smaller batch in a single statement
+_INSERT_PAGE_SIZE = 500
+
+# Fixed seed: every seed-demo run produces the same order history
+_DEMO_RANDOM_SEED = 0x5E3D
+
+# Demo content; roles and units hold UserRole / UnitOfMeasure values
+_DEMO_EMPLOYEES = (
+    ("María García", "maria@demo.restaurant", "waiter"),
+    ("Carlos Rodríguez", "carlos@demo.restaurant", "waiter"),
+    ("Ana López", "ana@demo.restaurant", "kitchen"),
+    ("Luis Hernández", "luis@demo.restaurant", "kitchen"),
+    ("Sofia Martínez", "sofia@demo.restaurant", "cashier"),
+)
+
+# (category, ((name, description, price, image_url), ...))
+_DEMO_MENU = (
+    ("🥗 Entradas", (
+        ("Guacamole con Totopos", "Guacamole fresco preparado al momento con aguacate Hass, cebolla, cilantro y chile serrano. Servido con totopos crujientes.", 145.00, "https://images.unsplash.com/photo-1582169296194-e4d644c48063?w=400"),
+        ("Quesadillas de Flor de Calabaza", "Tres quesadillas de tortilla de maíz azul con flor de calabaza, queso Oaxaca y epazote.", 135.00, "https://images.unsplash.com/photo-1628181915535-a2e2fac9bdd3?w=400"),
+        ("Tostadas de Tinga", "Dos tostadas de pollo en salsa de chipotle con crema, queso fresco y aguacate.", 125.00, "https://images.unsplash.com/photo-1565299585323-38d6b0865b47?w=400"),
+        ("Sopa Azteca", "Sopa de tortilla con chile pasilla, aguacate, crema y queso Oaxaca.", 95.00, "https://images.unsplash.com/photo-1547592166-23ac45744acd?w=400"),
+        ("Coctel de Camarón", "Camarones frescos en salsa cóctel con aguacate, cilantro y galletas saladas.", 210.00, "https://images.unsplash.com/photo-1565558118227-28e1a3a7f1c1?w=400"),
+    )),
+    ("🌮 Platos Fuertes", (
+        ("Tacos al Pastor", "Tres tacos de cerdo adobado cocinado en trompo, con piña, cilantro y cebolla.", 185.00, "https://images.unsplash.com/photo-1551504734-5ee1c4a1479b?w=400"),
+        ("Enchiladas Suizas", "Tres enchiladas de pollo bañadas en salsa verde cremosa con queso gratinado.", 195.00, "https://images.unsplash.com/photo-1583912267550-d974311a9a6e?w=400"),
+        ("Mole Poblano con Pollo", "Pechuga de pollo en mole tradicional de 28 ingredientes, con arroz rojo.", 245.00, "https://images.unsplash.com/photo-1599789197514-47270cd526b4?w=400"),
+        ("Arrachera a la Parrilla", "300g de arrachera marinada con nopales, cebollas cambray y guacamole.", 345.00, "https://images.unsplash.com/photo-1588166524941-3bf61a9c41db?w=400"),
+        ("Chiles Rellenos", "Dos chiles poblanos rellenos de queso y picadillo, bañados en caldillo de tomate.", 225.00, "https://images.unsplash.com/photo-1588166524941-3bf61a9c41db?w=400"),
+        ("Pescado a la Veracruzana", "Filete de huachinango en salsa de tomate, aceitunas, alcaparras y chiles güeros.", 295.00, "https://images.unsplash.com/photo-1519708227418-c8fd9a32b7a2?w=400"),
+        ("Carnitas Michoacanas", "Carnitas tradicionales con salsa verde, cebolla, cilantro y tortillas.", 275.00, "https://images.unsplash.com/photo-1626700051175-6818013e1d4f?w=400"),
+    )),
+    ("🍰 Postres", (
+        ("Churros con Chocolate", "Cuatro churros crujientes espolvoreados con azúcar y canela, con chocolate caliente.", 95.00, "https://images.unsplash.com/photo-1565735513753-1d9a51d6f75f?w=400"),
+        ("Flan Napolitano", "Flan cremoso de vainilla con caramelo casero.", 85.00, "https://images.unsplash.com/photo-1565958011703-44f9829ba187?w=400"),
+        ("Tres Leches", "Bizcocho empapado en tres leches con merengue italiano.", 110.00, "https://images.unsplash.com/photo-1571115177098-24ec42ed204d?w=400"),
+        ("Helado de Mamey", "Dos bolas de helado artesanal de mamey con galleta.", 75.00, "https://images.unsplash.com/photo-1501443762994-82bd5dace89a?w=400"),
+    )),
+    ("🍹 Bebidas", (
+        ("Agua de Horchata", "Agua fresca de arroz con canela y vainilla (1L).", 55.00, "https://images.unsplash.com/photo-1561758033-d89a9ad46330?w=400"),
+        ("Limonada con Chía", "Limonada natural con semillas de chía (1L).", 50.00, "https://images.unsplash.com/photo-1621263764928-df1444c5e859?w=400"),
+        ("Margarita Clásica", "Tequila, triple sec, jugo de limón y sal.", 145.00, "https://images.unsplash.com/photo-1546171753-e89fd5b81ea2?w=400"),
+        ("Cerveza Artesanal", "Cerveza local IPA o Lager (473ml).", 95.00, "https://images.unsplash.com/photo-1566633806327-68e152aaf26d?w=400"),
+    )),
+)
+
+# (name, unit, stock, min_stock, cost)
+_DEMO_INGREDIENTS = (
+    ("Aguacate Hass", "kg", 15.0, 3.0, 85.00),
+    ("Crema Ácida", "lt", 10.0, 2.0, 55.00),
+    ("Chile Poblano", "kg", 8.0, 2.0, 45.00),
+    ("Queso Panela", "kg", 5.0, 1.0, 95.00),
+    ("Cilantro", "kg", 3.0, 0.5, 35.00),
+    ("Limón", "kg", 10.0, 2.0, 25.00),
+    ("Cerveza Artesanal", "pza", 48.0, 12.0, 35.00),
+    ("Tequila Blanco", "lt", 5.0, 1.0, 280.00),
+)
+
+
+
+class _DemoMenuItem(NamedTuple):
+    """Menu item columns the order simulation reads"""
+    id: object
+    name: str
+    price: float
+    route_to: object
+
+
+def _copy_value(value):
+    """Adapt a bulk-insert row value to what asyncpg's COPY encoder expects."""
+    if isinstance(value, enum.Enum):
+        return value.value  # SQLEnum columns store the member values
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)  # JSONB is sent as text
+    return value
+
+
+async def _bulk_insert(db, model, rows: list) -> None:
+    """
+    Write homogeneous row dicts for `model` inside the session's transaction.
+    
+    Large batches use PostgreSQL COPY on the session's own asyncpg
+    connection; small ones use an executemany INSERT. COPY bypasses
+    client-side column defaults, so rows must spell out every column
+    that has no server default.
+    """
+    from sqlalchemy import insert
+    
+    if not rows:
+        return
+    if len(rows) < _COPY_THRESHOLD:
+        await db.execute(
+            insert(model).execution_options(insertmanyvalues_page_size=_INSERT_PAGE_SIZE),
+            rows,
+        )
+        return
+    
+    columns = list(rows[0])
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        model.__tablename__,
+        columns=columns,
+        records=[tuple(_copy_value(row[c]) for c in columns) for row in rows],
+    )
+
+
 async def _seed_demo_data_async(tenant_id: str) -> dict:
     """
     Create realistic demo data for a tenant.
@@ -473,275 +677,264 @@ async def _seed_demo_data_async(tenant_id: str) -> dict:
     - 50 past orders (for analytics/charts)
     - Initial inventory
     """
-    import random
-    from datetime import timedelta
     from sqlalchemy import select
+    from app.core.database import async_session_maker
+    from app.core.security import get_password_hash
     from app.models.models import (
+        Tenant, User, Table as TableModel, Ingredient,
         MenuCategory, MenuItem, RouteDestination,
         Order, OrderItem, OrderStatus, OrderSource, OrderItemStatus,
         ServiceType
     )
     
-    async with async_session_maker() as db:
-        # Verify tenant exists
+    # One transaction for the whole seed: commits once on exit, rolls
+    # back on error. Ids are generated client-side, so nothing needs a
+    # flush to learn its primary key
+    async with async_session_maker() as db, db.begin():
+        # Verify tenant exists (only its id is needed, not the entity)
         result = await db.execute(
-            select(Tenant).where(Tenant.id == tenant_id)
+            select(Tenant.id).where(Tenant.id == tenant_id)
         )
-        tenant = result.scalar_one_or_none()
+        tenant_uuid = result.scalar_one_or_none()
         
-        if not tenant:
+        if tenant_uuid is None:
             raise ValueError(f"Tenant not found: {tenant_id}")
         
-        stats = {
-            "employees": 0,
-            "categories": 0,
-            "menu_items": 0,
-            "orders": 0,
-            "order_items": 0,
-            "ingredients": 0
-        }
-        
-        # ==========================================
-        # 1. Create Employees
-        # ==========================================
-        employees_data = [
-            ("María García", "maria@demo.restaurant", UserRole.WAITER),
-            ("Carlos Rodríguez", "carlos@demo.restaurant", UserRole.WAITER),
-            ("Ana López", "ana@demo.restaurant", UserRole.KITCHEN),
-            ("Luis Hernández", "luis@demo.restaurant", UserRole.KITCHEN),
-            ("Sofia Martínez", "sofia@demo.restaurant", UserRole.CASHIER),
-        ]
-        
-        created_users = []
-        for name, email, role in employees_data:
-            # Check if exists
-            existing = await db.execute(
-                select(User).where(User.email == email)
-            )
-            if existing.scalar_one_or_none():
-                continue
-                
-            user = User(
-                id=uuid4(),
-                tenant_id=tenant.id,
-                name=name,
-                email=email,
-                hashed_password=get_password_hash("Demo2024!"),
-                role=role,
-                is_active=True
-            )
-            db.add(user)
-            created_users.append(user)
-        
-        await db.flush()
-        stats["employees"] = len(created_users)
-        
-        # ==========================================
-        # 2. Create Menu Categories & Items
-        # ==========================================
-        menu_data = {
-            "🥗 Entradas": [
-                ("Guacamole con Totopos", "Guacamole fresco preparado al momento con aguacate Hass, cebolla, cilantro y chile serrano. Servido con totopos crujientes.", 145.00, "https://images.unsplash.com/photo-1582169296194-e4d644c48063?w=400"),
-                ("Quesadillas de Flor de Calabaza", "Tres quesadillas de tortilla de maíz azul con flor de calabaza, queso Oaxaca y epazote.", 135.00, "https://images.unsplash.com/photo-1628181915535-a2e2fac9bdd3?w=400"),
-                ("Tostadas de Tinga", "Dos tostadas de pollo en salsa de chipotle con crema, queso fresco y aguacate.", 125.00, "https://images.unsplash.com/photo-1565299585323-38d6b0865b47?w=400"),
-                ("Sopa Azteca", "Sopa de tortilla con chile pasilla, aguacate, crema y queso Oaxaca.", 95.00, "https://images.unsplash.com/photo-1547592166-23ac45744acd?w=400"),
-                ("Coctel de Camarón", "Camarones frescos en salsa cóctel con aguacate, cilantro y galletas saladas.", 210.00, "https://images.unsplash.com/photo-1565558118227-28e1a3a7f1c1?w=400"),
-            ],
-            "🌮 Platos Fuertes": [
-                ("Tacos al Pastor", "Tres tacos de cerdo adobado cocinado en trompo, con piña, cilantro y cebolla.", 185.00, "https://images.unsplash.com/photo-1551504734-5ee1c4a1479b?w=400"),
-                ("Enchiladas Suizas", "Tres enchiladas de pollo bañadas en salsa verde cremosa con queso gratinado.", 195.00, "https://images.unsplash.com/photo-1583912267550-d974311a9a6e?w=400"),
-                ("Mole Poblano con Pollo", "Pechuga de pollo en mole tradicional de 28 ingredientes, con arroz rojo.", 245.00, "https://images.unsplash.com/photo-1599789197514-47270cd526b4?w=400"),
-                ("Arrachera a la Parrilla", "300g de arrachera marinada con nopales, cebollas cambray y guacamole.", 345.00, "https://images.unsplash.com/photo-1588166524941-3bf61a9c41db?w=400"),
-                ("Chiles Rellenos", "Dos chiles poblanos rellenos de queso y picadillo, bañados en caldillo de tomate.", 225.00, "https://images.unsplash.com/photo-1588166524941-3bf61a9c41db?w=400"),
-                ("Pescado a la Veracruzana", "Filete de huachinango en salsa de tomate, aceitunas, alcaparras y chiles güeros.", 295.00, "https://images.unsplash.com/photo-1519708227418-c8fd9a32b7a2?w=400"),
-                ("Carnitas Michoacanas", "Carnitas tradicionales con salsa verde, cebolla, cilantro y tortillas.", 275.00, "https://images.unsplash.com/photo-1626700051175-6818013e1d4f?w=400"),
-            ],
-            "🍰 Postres": [
-                ("Churros con Chocolate", "Cuatro churros crujientes espolvoreados con azúcar y canela, con chocolate caliente.", 95.00, "https://images.unsplash.com/photo-1565735513753-1d9a51d6f75f?w=400"),
-                ("Flan Napolitano", "Flan cremoso de vainilla con caramelo casero.", 85.00, "https://images.unsplash.com/photo-1565958011703-44f9829ba187?w=400"),
-                ("Tres Leches", "Bizcocho empapado en tres leches con merengue italiano.", 110.00, "https://images.unsplash.com/photo-1571115177098-24ec42ed204d?w=400"),
-                ("Helado de Mamey", "Dos bolas de helado artesanal de mamey con galleta.", 75.00, "https://images.unsplash.com/photo-1501443762994-82bd5dace89a?w=400"),
-            ],
-            "🍹 Bebidas": [
-                ("Agua de Horchata", "Agua fresca de arroz con canela y vainilla (1L).", 55.00, "https://images.unsplash.com/photo-1561758033-d89a9ad46330?w=400"),
-                ("Limonada con Chía", "Limonada natural con semillas de chía (1L).", 50.00, "https://images.unsplash.com/photo-1621263764928-df1444c5e859?w=400"),
-                ("Margarita Clásica", "Tequila, triple sec, jugo de limón y sal.", 145.00, "https://images.unsplash.com/photo-1546171753-e89fd5b81ea2?w=400"),
-                ("Cerveza Artesanal", "Cerveza local IPA o Lager (473ml).", 95.00, "https://images.unsplash.com/photo-1566633806327-68e152aaf26d?w=400"),
-            ],
-        }
-        
-        created_items = []
-        for cat_name, items in menu_data.items():
-            # Check if category exists
-            existing_cat = await db.execute(
-                select(MenuCategory).where(
-                    MenuCategory.tenant_id == tenant.id,
-                    MenuCategory.name == cat_name
+        # The order simulation needs the tenant's menu items, tables and
+        # users. What existed before this run is read on a second session
+        # while the inserts below run; rows this run inserts are added from
+        # memory, since the other session can't see them until commit
+        async def _load_existing():
+            async with async_session_maker() as read_db:
+                items = await read_db.execute(
+                    select(
+                        MenuItem.id, MenuItem.name, MenuItem.price, MenuItem.route_to
+                    ).join(MenuCategory).where(
+                        MenuCategory.tenant_id == tenant_uuid
+                    )
                 )
-            )
-            category = existing_cat.scalar_one_or_none()
+                menu_items = [_DemoMenuItem(*row) for row in items]
+                tables = await read_db.execute(
+                    select(TableModel.id).where(TableModel.tenant_id == tenant_uuid)
+                )
+                users = await read_db.execute(
+                    select(User.id).where(User.tenant_id == tenant_uuid)
+                )
+                return menu_items, list(tables.scalars()), list(users.scalars())
+        
+        existing_task = asyncio.create_task(_load_existing())
+        try:
+            stats = {
+                "employees": 0,
+                "categories": 0,
+                "menu_items": 0,
+                "orders": 0,
+                "order_items": 0,
+                "ingredients": 0
+            }
             
-            if not category:
-                category = MenuCategory(
-                    id=uuid4(),
-                    tenant_id=tenant.id,
-                    name=cat_name,
-                    description=f"Deliciosos platillos de la sección {cat_name}",
-                    sort_order=len(stats) + 1,
-                    is_active=True
+            # ==========================================
+            # 1. Create Employees
+            # ==========================================
+            # One round-trip for every existence check
+            existing_emails = set((await db.execute(
+                select(User.email).where(
+                    User.email.in_([email for _, email, _ in _DEMO_EMPLOYEES])
                 )
-                db.add(category)
-                await db.flush()
-                stats["categories"] += 1
+            )).scalars().all())
             
-            for item_name, description, price, image_url in items:
-                # Check if item exists
-                existing_item = await db.execute(
-                    select(MenuItem).where(
-                        MenuItem.category_id == category.id,
-                        MenuItem.name == item_name
-                    )
+            # All demo employees share one password, so it is hashed once
+            # (off the event loop) rather than once per user
+            demo_hash = await asyncio.to_thread(get_password_hash, "Demo2024!")
+            
+            # Rows are collected as dicts with pre-generated ids and written
+            # with one executemany INSERT per entity kind
+            user_rows = [
+                {
+                    "id": uuid4(),
+                    "tenant_id": tenant_uuid,
+                    "name": name,
+                    "email": email,
+                    "hashed_password": demo_hash,
+                    "role": role,
+                    "is_active": True,
+                }
+                for name, email, role in _DEMO_EMPLOYEES
+                if email not in existing_emails
+            ]
+            await _bulk_insert(db, User, user_rows)
+            stats["employees"] = len(user_rows)
+            
+            # ==========================================
+            # 2. Create Menu Categories & Items
+            # ==========================================
+            # One SELECT for the existing categories and one for their items
+            existing_categories = dict((await db.execute(
+                select(MenuCategory.name, MenuCategory.id).where(
+                    MenuCategory.tenant_id == tenant_uuid,
+                    MenuCategory.name.in_([cat_name for cat_name, _ in _DEMO_MENU])
                 )
-                if existing_item.scalar_one_or_none():
-                    continue
-                
+            )).all())
+            existing_items = set()
+            if existing_categories:
+                existing_items = set((await db.execute(
+                    select(MenuItem.category_id, MenuItem.name).where(
+                        MenuItem.category_id.in_(list(existing_categories.values()))
+                    )
+                )).all())
+            
+            category_rows = []
+            item_rows = []
+            for cat_name, items in _DEMO_MENU:
+                category_id = existing_categories.get(cat_name)
+            
+                if category_id is None:
+                    category_id = uuid4()
+                    category_rows.append({
+                        "id": category_id,
+                        "tenant_id": tenant_uuid,
+                        "name": cat_name,
+                        "description": f"Deliciosos platillos de la sección {cat_name}",
+                        "sort_order": len(stats) + 1,
+                        "is_active": True,
+                    })
+            
                 route = RouteDestination.BAR if "Bebidas" in cat_name else RouteDestination.KITCHEN
+            
+                for item_name, description, price, image_url in items:
+                    if (category_id, item_name) in existing_items:
+                        continue
                 
-                menu_item = MenuItem(
-                    id=uuid4(),
-                    category_id=category.id,
-                    name=item_name,
-                    description=description,
-                    price=price,
-                    image_url=image_url,
-                    route_to=route,
-                    is_available=True,
-                    tax_config={"iva": 0.16}
-                )
-                db.add(menu_item)
-                created_items.append(menu_item)
-        
-        await db.flush()
-        stats["menu_items"] = len(created_items)
-        
-        # Get all menu items for order simulation
-        all_items_result = await db.execute(
-            select(MenuItem).join(MenuCategory).where(
-                MenuCategory.tenant_id == tenant.id
-            )
-        )
-        all_menu_items = list(all_items_result.scalars().all())
-        
-        # Get tables
-        tables_result = await db.execute(
-            select(Table).where(Table.tenant_id == tenant.id)
-        )
-        tables = list(tables_result.scalars().all())
+                    item_rows.append({
+                        "id": uuid4(),
+                        "category_id": category_id,
+                        "name": item_name,
+                        "description": description,
+                        "price": price,
+                        "image_url": image_url,
+                        "route_to": route,
+                        "is_available": True,
+                        "tax_config": {"iva": 0.16},
+                    })
+            
+            # Categories first: the items reference them
+            await _bulk_insert(db, MenuCategory, category_rows)
+            await _bulk_insert(db, MenuItem, item_rows)
+            stats["categories"] = len(category_rows)
+            stats["menu_items"] = len(item_rows)
+            
+            existing_menu_items, table_ids, user_ids = await existing_task
+        finally:
+            # On an insert failure, stop the read and close its session
+            existing_task.cancel()
+            await asyncio.gather(existing_task, return_exceptions=True)
         
-        # Get users (waiters)
-        users_result = await db.execute(
-            select(User).where(User.tenant_id == tenant.id)
-        )
-        users = list(users_result.scalars().all())
+        all_menu_items = existing_menu_items + [
+            _DemoMenuItem(row["id"], row["name"], row["price"], row["route_to"])
+            for row in item_rows
+        ]
+        user_ids += [row["id"] for row in user_rows]
         
-        if not all_menu_items or not tables or not users:
-            await db.commit()
+        if not all_menu_items or not table_ids or not user_ids:
             return stats
         
         # ==========================================
         # 3. Simulate 50 Past Orders
         # ==========================================
+        # Private, seeded generator with its bound methods hoisted out of
+        # the loop
+        rng = random.Random(_DEMO_RANDOM_SEED)
+        randint, choice, sample = rng.randint, rng.choice, rng.sample
+        order_sources = (OrderSource.POS, OrderSource.SELF_SERVICE)
+        now = datetime.utcnow()
+        
+        order_rows = []
+        order_item_rows = []
         for i in range(50):
             # Random date in last 30 days
-            days_ago = random.randint(1, 30)
-            hours_ago = random.randint(1, 12)
-            order_date = datetime.utcnow() - timedelta(days=days_ago, hours=hours_ago)
+            order_date = now - timedelta(days=randint(1, 30), hours=randint(1, 12))
             
-            table = random.choice(tables)
-            waiter = random.choice(users)
+            table_id = choice(table_ids)
+            waiter_id = choice(user_ids)
             
             # Random number of items (1-5)
-            num_items = random.randint(1, 5)
-            selected_items = random.sample(all_menu_items, min(num_items, len(all_menu_items)))
+            num_items = randint(1, 5)
+            selected_items = sample(all_menu_items, min(num_items, len(all_menu_items)))
             
-            subtotal = sum(item.price * random.randint(1, 3) for item in selected_items)
-            tax = subtotal * 0.16
-            total = subtotal + tax
+            # One quantity per item, shared by the totals and the order items
+            quantities = [randint(1, 3) for _ in selected_items]
+            subtotal = sum(item.price * qty for item, qty in zip(selected_items, quantities))
+            tax = round(subtotal * 0.16, 2)
+            total = round(subtotal + tax, 2)
             
-            order = Order(
-                id=uuid4(),
-                tenant_id=tenant.id,
-                table_id=table.id,
-                waiter_id=waiter.id,
-                status=OrderStatus.PAID,
-                order_source=random.choice([OrderSource.POS, OrderSource.SELF_SERVICE]),
-                service_type=ServiceType.DINE_IN,
-                subtotal=subtotal,
-                tax=tax,
-                total=total,
-                created_at=order_date,
-                updated_at=order_date
-            )
-            db.add(order)
-            await db.flush()
-            stats["orders"] += 1
+            # The id is generated here so the items can reference it
+            # without flushing the order first
+            order_id = uuid4()
+            order_rows.append({
+                "id": order_id,
+                "tenant_id": tenant_uuid,
+                "table_id": table_id,
+                "waiter_id": waiter_id,
+                "status": OrderStatus.PAID,
+                "order_source": choice(order_sources),
+                "service_type": ServiceType.DINE_IN,
+                "subtotal": subtotal,
+                "tax": tax,
+                "total": total,
+                "created_at": order_date,
+                "updated_at": order_date,
+            })
             
             # Create order items
-            for menu_item in selected_items:
-                quantity = random.randint(1, 3)
-                order_item = OrderItem(
-                    id=uuid4(),
-                    order_id=order.id,
-                    menu_item_id=menu_item.id,
-                    menu_item_name=menu_item.name,
-                    route_to=menu_item.route_to,
-                    quantity=quantity,
-                    unit_price=menu_item.price,
-                    status=OrderItemStatus.SERVED,
-                    created_at=order_date
-                )
-                db.add(order_item)
-                stats["order_items"] += 1
+            for menu_item, quantity in zip(selected_items, quantities):
+                order_item_rows.append({
+                    "id": uuid4(),
+                    "order_id": order_id,
+                    "menu_item_id": menu_item.id,
+                    "menu_item_name": menu_item.name,
+                    "route_to": menu_item.route_to,
+                    "quantity": quantity,
+                    "unit_price": menu_item.price,
+                    "selected_modifiers": [],
+                    "status": OrderItemStatus.SERVED,
+                    "prep_time_minutes": 15,
+                    "created_at": order_date,
+                })
+        
+        # Orders first: the items reference them
+        await _bulk_insert(db, Order, order_rows)
+        await _bulk_insert(db, OrderItem, order_item_rows)
+        stats["orders"] = len(order_rows)
+        stats["order_items"] = len(order_item_rows)
         
         # ==========================================
         # 4. Add More Ingredients
         # ==========================================
-        additional_ingredients = [
-            ("Aguacate Hass", UnitOfMeasure.KG, 15.0, 3.0, 85.00),
-            ("Crema Ácida", UnitOfMeasure.LT, 10.0, 2.0, 55.00),
-            ("Chile Poblano", UnitOfMeasure.KG, 8.0, 2.0, 45.00),
-            ("Queso Panela", UnitOfMeasure.KG, 5.0, 1.0, 95.00),
-            ("Cilantro", UnitOfMeasure.KG, 3.0, 0.5, 35.00),
-            ("Limón", UnitOfMeasure.KG, 10.0, 2.0, 25.00),
-            ("Cerveza Artesanal", UnitOfMeasure.PZA, 48.0, 12.0, 35.00),
-            ("Tequila Blanco", UnitOfMeasure.LT, 5.0, 1.0, 280.00),
-        ]
-        
-        for ing_name, unit, stock, min_stock, cost in additional_ingredients:
-            existing = await db.execute(
-                select(Ingredient).where(
-                    Ingredient.tenant_id == tenant.id,
-                    Ingredient.name == ing_name
-                )
+        existing_ingredients = set((await db.execute(
+            select(Ingredient.name).where(
+                Ingredient.tenant_id == tenant_uuid,
+                Ingredient.name.in_([ing[0] for ing in _DEMO_INGREDIENTS])
             )
-            if existing.scalar_one_or_none():
-                continue
-            
-            ingredient = Ingredient(
-                id=uuid4(),
-                tenant_id=tenant.id,
-                name=ing_name,
-                sku=f"ING-{str(uuid4())[:8].upper()}",
-                unit=unit,
-                stock_quantity=stock,
-                min_stock_alert=min_stock,
-                cost_per_unit=cost,
-                is_active=True
-            )
-            db.add(ingredient)
-            stats["ingredients"] += 1
+        )).scalars().all())
+        
+        ingredient_rows = [
+            {
+                "id": uuid4(),
+                "tenant_id": tenant_uuid,
+                "name": ing_name,
+                "sku": f"ING-{token_hex(4).upper()}",
+                "unit": unit,
+                "stock_quantity": stock,
+                "min_stock_alert": min_stock,
+                "cost_per_unit": cost,
+                "is_active": True,
+            }
+            for ing_name, unit, stock, min_stock, cost in _DEMO_INGREDIENTS
+            if ing_name not in existing_ingredients
+        ]
+        await _bulk_insert(db, Ingredient, ingredient_rows)
+        stats["ingredients"] = len(ingredient_rows)
         
-        await db.commit()
         return stats
 
 
@@ -802,5 +995,12 @@ def seed_demo_data(
 # ============================================
 
 if __name__ == "__main__":
+    # libuv-based loop for every asyncio.run() below (optional, not on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     app()
 
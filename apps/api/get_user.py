@@ -1,13 +1,16 @@
 import asyncio
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only
 from sqlalchemy import select
-from app.core.database import SessionLocal
+from app.core.database import async_session_maker
 from app.models.models import User
 
 async def main():
-    async with SessionLocal() as session:
-        result = await session.execute(select(User))
-        user = result.scalars().first()
+    async with async_session_maker() as session:
+        # LIMIT 1 in SQL and only the printed columns
+        result = await session.execute(
+            select(User).options(load_only(User.id, User.email)).limit(1)
+        )
+        user = result.scalar_one_or_none()
         if user:
             print(f"User email: {user.email}")
             print(f"User ID: {user.id}")
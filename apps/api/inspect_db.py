@@ -1,28 +1,35 @@
 import asyncio
-from sqlalchemy import inspect
+from collections import defaultdict
+from sqlalchemy import text
 from app.core.database import engine
 from app.models.cash_management import CashShift, CashTransaction
 import app.models.models
 
-async def main():
-    def sync_inspect(conn):
-        inspector = inspect(conn)
-        
-        # Get DB columns
-        db_shift_cols = [c["name"] for c in inspector.get_columns("cash_shifts")]
-        db_txn_cols = [c["name"] for c in inspector.get_columns("cash_transactions")]
-        
-        # Get Model columns
-        model_shift_cols = [c.key for c in CashShift.__table__.columns]
-        model_txn_cols = [c.key for c in CashTransaction.__table__.columns]
-        
-        print("Missing in cash_shifts DB table:")
-        print(set(model_shift_cols) - set(db_shift_cols))
-        print("Missing in cash_transactions DB table:")
-        print(set(model_txn_cols) - set(db_txn_cols))
+# Both tables' columns in one round-trip, instead of one reflection
+# pass per table
+COLUMNS_QUERY = text(
+    "SELECT table_name, column_name FROM information_schema.columns "
+    "WHERE table_schema = current_schema() "
+    "AND table_name IN ('cash_shifts', 'cash_transactions')"
+)
 
+async def main():
     async with engine.connect() as conn:
-        await conn.run_sync(sync_inspect)
+        result = await conn.execute(COLUMNS_QUERY)
+
+    # Get DB columns
+    db_cols = defaultdict(set)
+    for table_name, column_name in result:
+        db_cols[table_name].add(column_name)
+
+    # Get Model columns
+    model_shift_cols = {c.key for c in CashShift.__table__.columns}
+    model_txn_cols = {c.key for c in CashTransaction.__table__.columns}
+
+    print("Missing in cash_shifts DB table:")
+    print(model_shift_cols - db_cols["cash_shifts"])
+    print("Missing in cash_transactions DB table:")
+    print(model_txn_cols - db_cols["cash_transactions"])
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -9,24 +9,34 @@ Production Features:
 """
 
 import asyncio
+import logging
 import os
+import platform
+import sys
 import time
-import uuid
 from contextlib import asynccontextmanager
+from datetime import datetime
+from secrets import token_hex
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
+import orjson
+from cachetools import TTLCache
+from fastapi import Depends, FastAPI, WebSocket, WebSocketDisconnect, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import text
 import sentry_sdk
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
 
 from app.core.config import get_settings
-from app.core.database import init_db
+from app.core.database import init_db, async_session_maker
+from app.core.security import decode_token_cached, require_admin
+from app.core.rate_limiter import RateLimiter
 from app.core.websocket_manager import ws_manager
-from app.core.scheduler import init_scheduler, start_scheduler, shutdown_scheduler
+from app.core.scheduler import init_scheduler, start_scheduler, shutdown_scheduler, get_scheduler_status
 from app.core.logging_config import setup_logging, set_log_context, clear_log_context, get_logger
 from app.core.activity_logger import activity_logger
+from app.services.procurement_service import shutdown_proc_pool
 
 # Startup state tracking for health checks
 _startup_complete = False
@@ -113,7 +123,6 @@ async def lifespan(app: FastAPI):
     
     # Auto-fix: Ensure all tenants have self_service enabled (core feature for all plans)
     try:
-        from app.core.database import async_session_maker
         from sqlalchemy import select
         from sqlalchemy.orm.attributes import flag_modified
         from app.models.models import Tenant as TenantModel
@@ -150,9 +159,25 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"WARNING:  ⚠️ Redis connection failed: {type(e).__name__}: {e}")
     
+    # Dedicated one-connection engine for /health: the app engine uses
+    # NullPool (a fresh connect per session), while this keeps one warm
+    # connection so probes neither reconnect nor compete with requests
+    from sqlalchemy.ext.asyncio import create_async_engine
+    app.state.health_engine = create_async_engine(
+        settings.database_url, pool_size=1, max_overflow=1, pool_timeout=0.5
+    )
+    
+    # Dedicated small Redis client for /health probes; from_url is lazy, so
+    # this never blocks startup, and probes reuse its pool instead of
+    # building (and tearing down) a client per call
+    import redis.asyncio as aioredis
+    app.state.redis_health = aioredis.from_url(
+        settings.redis_url, max_connections=4, socket_timeout=1.0
+    )
+    
     # Start Redis listener in background (only if connected, OPTIONAL)
     if ws_manager.redis_client is not None:
-        asyncio.create_task(ws_manager.listen_redis())
+        ws_manager.start_listener()
         print("INFO:     📡 Redis pub/sub listener started")
     else:
         print("INFO:     📡 Redis pub/sub skipped (no connection)")
@@ -188,8 +213,16 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             print(f"WARNING:  ⚠️ Scheduler shutdown error: {e}")
     
+    # Stop forecasting worker processes (if any were started)
+    shutdown_proc_pool()
+    
     # Disconnect from Redis
     await ws_manager.disconnect_redis()
+    try:
+        await app.state.redis_health.close()
+    except Exception as e:
+        print(f"WARNING:  ⚠️ Redis health client close error: {e}")
+    await app.state.health_engine.dispose()
     
     print("INFO:     👋 Goodbye!")
 
@@ -214,6 +247,9 @@ app = FastAPI(
 # Request Logging Middleware
 # ============================================
 
+# Health checks and static files are not logged
+_SKIP_LOG_PATHS = frozenset({"/health", "/healthz", "/ping", "/favicon.ico"})
+
 @app.middleware("http")
 async def request_logging_middleware(request: Request, call_next):
     """
@@ -226,8 +262,8 @@ async def request_logging_middleware(request: Request, call_next):
     - Extracts user context from JWT if available
     """
     # Generate unique request ID
-    request_id = str(uuid.uuid4())[:12]
-    start_time = time.perf_counter()
+    request_id = token_hex(6)  # 12 hex chars, no UUID object to format and slice
+    start_ns = time.perf_counter_ns()
     
     # Try to extract user info from JWT token
     user_id = None
@@ -235,11 +271,9 @@ async def request_logging_middleware(request: Request, call_next):
     auth_header = request.headers.get("Authorization", "")
     if auth_header.startswith("Bearer "):
         try:
-            from app.core.security import decode_access_token
-            token = auth_header[7:]
-            payload = decode_access_token(token)
-            user_id = payload.get("sub")
-            tenant_id = payload.get("tenant_id")
+            token_data = decode_token_cached(auth_header[7:])
+            user_id = token_data.user_id
+            tenant_id = token_data.tenant_id
         except Exception:
             pass  # Invalid token, continue without context
     
@@ -248,13 +282,13 @@ async def request_logging_middleware(request: Request, call_next):
     
     # Skip logging for health checks and static files
     path = request.url.path
-    skip_logging = path in ["/health", "/ping", "/favicon.ico"] or path.startswith("/_next")
+    skip_logging = path in _SKIP_LOG_PATHS or path.startswith("/_next")
     
     try:
         response = await call_next(request)
         
-        # Calculate duration
-        duration_ms = (time.perf_counter() - start_time) * 1000
+        # Calculate duration (integer microseconds; ms only when logged)
+        duration_us = (time.perf_counter_ns() - start_ns) // 1000
         
         # Log the request (skip noisy endpoints)
         if not skip_logging:
@@ -262,7 +296,7 @@ async def request_logging_middleware(request: Request, call_next):
                 method=request.method,
                 path=path,
                 status_code=response.status_code,
-                duration_ms=duration_ms
+                duration_ms=duration_us / 1000
             )
         
         # Add request ID to response headers for client debugging
@@ -271,7 +305,7 @@ async def request_logging_middleware(request: Request, call_next):
         return response
         
     except Exception as exc:
-        duration_ms = (time.perf_counter() - start_time) * 1000
+        duration_us = (time.perf_counter_ns() - start_ns) // 1000
         
         # Log the error
         activity_logger.error(
@@ -281,7 +315,7 @@ async def request_logging_middleware(request: Request, call_next):
                 "path": path,
                 "method": request.method,
                 "request_id": request_id,
-                "duration_ms": round(duration_ms, 2)
+                "duration_ms": duration_us // 10 / 100  # 2 decimals, integer math
             }
         )
         
@@ -319,171 +353,103 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Register API routers
-app.include_router(auth_router)
-app.include_router(signup_router)  # Signup checkout flow
-app.include_router(pos_router)
-app.include_router(billing_router)
-app.include_router(analytics_router)
-app.include_router(onboarding_router)
-app.include_router(cashier_router)
-app.include_router(printer_router)
-app.include_router(procurement_router)
-app.include_router(inventory_router)
-app.include_router(catering_router, prefix="/catering", tags=["Catering"])
-app.include_router(customers_router, prefix="/customers", tags=["Customers"])
-app.include_router(loyalty_router, prefix="/loyalty", tags=["Loyalty"])
-app.include_router(reservations_router, prefix="/reservations", tags=["Reservations"])
-app.include_router(promotions_router, prefix="/promotions", tags=["Promotions"])
-app.include_router(menu_router, tags=["Menu"])
-# Public dining endpoints (no /api prefix - consumer facing)
-app.include_router(dining_router, tags=["Self-Service Dining"])
-# Admin endpoints for table management
-app.include_router(admin_tables_router, tags=["Admin - Tables"])
-# Admin endpoints for system management (backups, jobs)
-app.include_router(admin_router, tags=["Admin - System"])
-# Subscription management (Stripe billing)
-app.include_router(subscription_router, tags=["Subscription"])
-# Stripe webhooks (public, no auth - signature verified internally)
-app.include_router(stripe_webhook_router, tags=["Webhooks"])
-# Legal compliance (terms, privacy - required for Stripe)
-app.include_router(legal_router, tags=["Legal"])
-# Table operations (transfer, etc.)
-app.include_router(tables_router, tags=["POS - Tables"])
-# Activity logging (frontend logs receiver)
-app.include_router(activity_router, tags=["Logging"])
-# KDS (Kitchen Display System) for cafeteria flow
-app.include_router(kds_router, tags=["Kitchen Display"])
+# Register API routers: (router, include_router kwargs), mounted straight
+# onto the app in one pass. No shared "/api" parent router: DigitalOcean
+# strips /api (root_path), and nesting would copy every route twice
+_ROUTERS = (
+    (auth_router, {}),
+    (signup_router, {}),  # Signup checkout flow
+    (pos_router, {}),
+    (billing_router, {}),
+    (analytics_router, {}),
+    (onboarding_router, {}),
+    (cashier_router, {}),
+    (printer_router, {}),
+    (procurement_router, {}),
+    (inventory_router, {}),
+    (catering_router, {"prefix": "/catering", "tags": ["Catering"]}),
+    (customers_router, {"prefix": "/customers", "tags": ["Customers"]}),
+    (loyalty_router, {"prefix": "/loyalty", "tags": ["Loyalty"]}),
+    (reservations_router, {"prefix": "/reservations", "tags": ["Reservations"]}),
+    (promotions_router, {"prefix": "/promotions", "tags": ["Promotions"]}),
+    (menu_router, {"tags": ["Menu"]}),
+    # Public dining endpoints (no /api prefix - consumer facing)
+    (dining_router, {"tags": ["Self-Service Dining"]}),
+    # Admin endpoints for table management
+    (admin_tables_router, {"tags": ["Admin - Tables"]}),
+    # Admin endpoints for system management (backups, jobs)
+    (admin_router, {"tags": ["Admin - System"]}),
+    # Subscription management (Stripe billing)
+    (subscription_router, {"tags": ["Subscription"]}),
+    # Stripe webhooks (public, no auth - signature verified internally)
+    (stripe_webhook_router, {"tags": ["Webhooks"]}),
+    # Legal compliance (terms, privacy - required for Stripe)
+    (legal_router, {"tags": ["Legal"]}),
+    # Table operations (transfer, etc.)
+    (tables_router, {"tags": ["POS - Tables"]}),
+    # Activity logging (frontend logs receiver)
+    (activity_router, {"tags": ["Logging"]}),
+    # KDS (Kitchen Display System) for cafeteria flow
+    (kds_router, {"tags": ["Kitchen Display"]}),
+)
+for _router, _kwargs in _ROUTERS:
+    app.include_router(_router, **_kwargs)
 
 
 # ============================================
 # WebSocket Endpoints
 # ============================================
 
-@app.websocket("/ws/kitchen")
-async def kitchen_websocket(websocket: WebSocket):
-    """
-    WebSocket for Kitchen Display System (KDS).
-    Receives new orders and item updates in real-time.
-    """
-    await ws_manager.connect(websocket, "kitchen")
-    kitchen_count = len(ws_manager.active_connections.get("kitchen", set()))
-    print(f"INFO:     🍳 Kitchen WS connected (total kitchen connections: {kitchen_count})")
-    try:
-        while True:
-            data = await websocket.receive_text()
-            if data == "ping":
-                await websocket.send_text("pong")
-    except WebSocketDisconnect:
-        pass
-    except Exception as e:
-        print(f"WARNING:  Kitchen WS error: {type(e).__name__}: {e}")
-    finally:
-        ws_manager.disconnect(websocket, "kitchen")
-        kitchen_count = len(ws_manager.active_connections.get("kitchen", set()))
-        print(f"INFO:     🍳 Kitchen WS disconnected (remaining: {kitchen_count})")
-
-
-@app.websocket("/ws/bar")
-async def bar_websocket(websocket: WebSocket):
-    """
-    WebSocket for Bar Display.
-    Only receives drink/bar items.
-    """
-    await ws_manager.connect(websocket, "bar")
-    try:
-        while True:
-            data = await websocket.receive_text()
-            if data == "ping":
-                await websocket.send_text("pong")
-    except WebSocketDisconnect:
-        pass
-    except Exception:
-        pass
-    finally:
-        ws_manager.disconnect(websocket, "bar")
-
-
-@app.websocket("/ws/waiter")
-async def waiter_websocket(websocket: WebSocket):
-    """
-    WebSocket for Waiter notifications.
-    Receives item ready alerts and customer call waiter requests.
-    """
-    await ws_manager.connect(websocket, "waiter")
-    try:
-        while True:
-            data = await websocket.receive_text()
-            if data == "ping":
-                await websocket.send_text("pong")
-    except WebSocketDisconnect:
-        pass
-    except Exception:
-        pass
-    finally:
-        ws_manager.disconnect(websocket, "waiter")
-
-
-@app.websocket("/ws/cashier")
-async def cashier_websocket(websocket: WebSocket):
-    """
-    WebSocket for Cashier/Payment station.
-    Receives bill request notifications with total amounts.
-    Priority channel for closing service cycles.
-    """
-    await ws_manager.connect(websocket, "cashier")
-    try:
-        while True:
-            data = await websocket.receive_text()
-            if data == "ping":
-                await websocket.send_text("pong")
-    except WebSocketDisconnect:
-        pass
-    except Exception:
-        pass
-    finally:
-        ws_manager.disconnect(websocket, "cashier")
-
-
-@app.websocket("/ws/pos")
-async def pos_websocket(websocket: WebSocket):
-    """
-    WebSocket for POS Dashboard.
-    Receives all table updates, bill requests, and order notifications.
-    """
-    await ws_manager.connect(websocket, "pos")
-    try:
-        while True:
-            data = await websocket.receive_text()
-            if data == "ping":
-                await websocket.send_text("pong")
-    except WebSocketDisconnect:
-        pass
-    except Exception:
-        pass
-    finally:
-        ws_manager.disconnect(websocket, "pos")
+# Staff channels share one handler; only the channel name differs
+#   kitchen: Kitchen Display System (new orders, item updates)
+#   bar:     Bar Display (drink/bar items only)
+#   waiter:  item ready alerts and customer call-waiter requests
+#   cashier: bill requests with totals (priority channel for closing service)
+#   pos:     POS dashboard (table updates, bill requests, order notifications)
+#   all:     dashboard/manager views (order_paid, sale_recorded, table_status)
+_STAFF_WS_CHANNELS = ("kitchen", "bar", "waiter", "cashier", "pos", "all")
+
+# Connect/disconnect logging goes through logging (level-gated, lazy
+# %-formatting) rather than print, so it costs nothing when INFO is off
+ws_logger = get_logger("restonext.ws")
+
+
+def _make_ws_handler(channel: str):
+    """Build the WebSocket endpoint for one staff channel."""
+    label = channel.capitalize()
+    
+    async def channel_websocket(websocket: WebSocket):
+        await ws_manager.connect(websocket, channel)
+        if ws_logger.isEnabledFor(logging.INFO):
+            ws_logger.info(
+                "%s WS connected (total %s connections: %d)",
+                label, channel, ws_manager.get_count(channel),
+            )
+        try:
+            while True:
+                # Only waits for the disconnect. Keepalive is protocol-level
+                # (uvicorn ws ping/pong); clients' "ping" text frames are ignored
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            ws_logger.warning("%s WS error: %s: %s", label, type(e).__name__, e)
+        finally:
+            ws_manager.disconnect(websocket, channel)
+            if ws_logger.isEnabledFor(logging.INFO):
+                ws_logger.info(
+                    "%s WS disconnected (remaining: %d)",
+                    label, ws_manager.get_count(channel),
+                )
+    
+    channel_websocket.__name__ = f"{channel}_websocket"
+    return channel_websocket
 
 
-@app.websocket("/ws/all")
-async def all_websocket(websocket: WebSocket):
-    """
-    WebSocket for Dashboard/Manager views.
-    Receives analytics broadcasts (order_paid, sale_recorded, table_status).
-    Used by the main dashboard for real-time KPI updates.
-    """
-    await ws_manager.connect(websocket, "all")
-    try:
-        while True:
-            data = await websocket.receive_text()
-            if data == "ping":
-                await websocket.send_text("pong")
-    except WebSocketDisconnect:
-        pass
-    except Exception:
-        pass
-    finally:
-        ws_manager.disconnect(websocket, "all")
+for _channel in _STAFF_WS_CHANNELS:
+    app.add_api_websocket_route(f"/ws/{_channel}", _make_ws_handler(_channel))
 
 
 @app.websocket("/ws/customer/{table_number}")
@@ -495,7 +461,12 @@ async def customer_websocket(websocket: WebSocket, table_number: int):
     await ws_manager.connect(websocket, f"table_{table_number}")
     try:
         while True:
-            data = await websocket.receive_json()
+            # Accept text or binary frames; orjson parses either without
+            # an intermediate decode
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            data = orjson.loads(message.get("bytes") or message.get("text"))
             if data.get("action") == "call_waiter":
                 # Notify waiters
                 await ws_manager.notify_call_waiter(
@@ -513,6 +484,91 @@ async def customer_websocket(websocket: WebSocket, table_number: int):
 # Health Check (Production Monitoring)
 # ============================================
 
+# Sub-check results are reused for a few seconds, so frequent liveness
+# probes cost one real DB/Redis probe per window instead of one per call.
+# Redis is optional, so a degraded Redis is re-probed less often
+_db_health_cache: TTLCache = TTLCache(maxsize=1, ttl=5)
+_redis_health_cache: TTLCache = TTLCache(maxsize=1, ttl=10)
+_db_health_lock = asyncio.Lock()
+_redis_health_lock = asyncio.Lock()
+
+# Probe statement built once rather than per health/debug call
+_SELECT_1 = text("SELECT 1")
+
+
+async def _check_database() -> dict:
+    """Cached database probe; concurrent callers share one in-flight check."""
+    result = _db_health_cache.get("database")
+    if result is not None:
+        return result
+    async with _db_health_lock:
+        result = _db_health_cache.get("database")
+        if result is not None:
+            return result
+        async def _probe():
+            # Health-only engine created in lifespan (health only runs after startup)
+            async with app.state.health_engine.connect() as conn:
+                await conn.execute(_SELECT_1)
+        
+        try:
+            # Bounded so a hung database can't outlive the probe's timeout
+            await asyncio.wait_for(_probe(), timeout=1.0)
+            result = {"status": "healthy"}
+        except asyncio.TimeoutError:
+            result = {
+                "status": "unhealthy",
+                "error": "Database check timed out after 1s"
+            }
+        except Exception as e:
+            result = {
+                "status": "unhealthy",
+                "error": str(e)[:100]
+            }
+        _db_health_cache["database"] = result
+        return result
+
+
+async def _check_redis() -> dict:
+    """Cached Redis probe; concurrent callers share one in-flight check."""
+    result = _redis_health_cache.get("redis")
+    if result is not None:
+        return result
+    async with _redis_health_lock:
+        result = _redis_health_cache.get("redis")
+        if result is not None:
+            return result
+        try:
+            # Shared client created in lifespan (health only runs after startup)
+            await asyncio.wait_for(app.state.redis_health.ping(), timeout=0.5)
+            result = {"status": "healthy"}
+        except Exception as e:
+            result = {
+                "status": "degraded",
+                "error": str(e)[:100],
+                "note": "WebSocket scaling disabled, local connections only"
+            }
+        _redis_health_cache["redis"] = result
+        return result
+
+
+# Constant bodies serialized once at import instead of on every call.
+# Only the bytes are shared: each request gets its own Response, since
+# middleware writes per-request headers (X-Request-ID) into it.
+# The "starting" answer drops its timestamp so it can be prebuilt too
+_STARTING_BODY = orjson.dumps({
+    "status": "starting",
+    "service": "restonext-api",
+    "message": "Application is initializing...",
+})
+_ROOT_BODY = orjson.dumps({
+    "name": settings.app_name,
+    "version": "1.0.0",
+    "docs": "/docs",  # Updated for DO
+})
+_PING_BODY = orjson.dumps({"ping": "pong", "ok": True})
+_NO_STORE = {"Cache-Control": "no-store"}
+
+
 @app.get("/health")
 async def health_check():
     """
@@ -523,19 +579,11 @@ async def health_check():
     - After startup: Verifies database connectivity (required) and Redis (optional)
     
     Returns 200 if healthy/starting, 503 only if database is down after startup.
+    Sub-check results are cached for a few seconds (see _check_database).
     """
-    from datetime import datetime
-    from sqlalchemy import text
-    import redis.asyncio as aioredis
-    
     # If startup hasn't completed, return 200 with "starting" status
     if not _startup_complete:
-        return {
-            "status": "starting",
-            "service": "restonext-api",
-            "timestamp": datetime.utcnow().isoformat(),
-            "message": "Application is initializing..."
-        }
+        return Response(content=_STARTING_BODY, media_type="application/json", headers=_NO_STORE)
     
     health_status = {
         "status": "healthy",
@@ -544,33 +592,15 @@ async def health_check():
         "checks": {}
     }
     
-    database_healthy = True
+    # Database (REQUIRED) and Redis (OPTIONAL) are independent: probe both
+    # at once, so a cold check costs max(db, redis) rather than the sum
+    database_check, redis_check = await asyncio.gather(_check_database(), _check_redis())
+    health_status["checks"]["database"] = database_check
+    health_status["checks"]["redis"] = redis_check
+    database_healthy = database_check["status"] == "healthy"
     
-    # Check Database (REQUIRED for healthy status)
-    try:
-        from app.core.database import async_session_maker
-        async with async_session_maker() as db:
-            await db.execute(text("SELECT 1"))
-        health_status["checks"]["database"] = {"status": "healthy"}
-    except Exception as e:
-        health_status["checks"]["database"] = {
-            "status": "unhealthy",
-            "error": str(e)[:100]
-        }
-        database_healthy = False
-    
-    # Check Redis (OPTIONAL - degraded is still 200)
-    try:
-        redis_client = aioredis.from_url(settings.redis_url)
-        await redis_client.ping()
-        await redis_client.close()
-        health_status["checks"]["redis"] = {"status": "healthy"}
-    except Exception as e:
-        health_status["checks"]["redis"] = {
-            "status": "degraded",
-            "error": str(e)[:100],
-            "note": "WebSocket scaling disabled, local connections only"
-        }
+    # Redis degraded is still 200
+    if redis_check["status"] != "healthy":
         # Redis is optional - don't fail health check
         health_status["status"] = "degraded"
     
@@ -582,21 +612,30 @@ async def health_check():
     return health_status
 
 
+# Liveness answer: no I/O, body built once. Probes that only need "process
+# is up" (Docker HEALTHCHECK, K8s livenessProbe) should hit /healthz and
+# keep /health, which probes the database and Redis, for readiness
+_HEALTHZ_BODY = b'{"ok":true}'
+
+
+@app.get("/healthz")
+async def liveness_check():
+    """Lightweight liveness probe; never touches the database or Redis."""
+    return Response(content=_HEALTHZ_BODY, media_type="application/json", headers=_NO_STORE)
+
+
 @app.get("/system/scheduler")
 async def scheduler_status():
     """
     Get scheduler status for admin dashboard.
     Shows all registered jobs and their next run times.
     """
-    from app.core.scheduler import get_scheduler_status
     return get_scheduler_status()
 
 
 @app.get("/system/info")
 async def system_info():
     """System information for admin dashboard"""
-    from app.core.scheduler import get_scheduler_status
-    
     scheduler = get_scheduler_status()
     
     return {
@@ -619,11 +658,7 @@ async def system_info():
 @app.get("/")
 async def root():
     """API root"""
-    return {
-        "name": settings.app_name,
-        "version": "1.0.0",
-        "docs": "/docs",  # Updated for DO
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/ping")
@@ -632,18 +667,26 @@ async def ping():
     Ultra-simple ping endpoint. 
     No dependencies, no auth, just returns "pong".
     """
-    return {"ping": "pong", "ok": True}
+    return Response(content=_PING_BODY, media_type="application/json", headers=_NO_STORE)
+
+
+# Diagnostics barely change between calls; reuse them for 30s so the
+# endpoint's fresh-connection DB probe can't be used to drain connections
+_debug_cache: TTLCache = TTLCache(maxsize=1, ttl=30)
 
 
 @app.get("/debug")
-async def debug_info():
+async def debug_info(
+    _rate_limit: None = Depends(RateLimiter(times=5, seconds=60)),
+    _admin=Depends(require_admin),
+):
     """
-    Debug endpoint for production diagnostics.
+    Debug endpoint for production diagnostics (admin only, 5 req/min per IP).
     Returns system information to help identify deployment issues.
     """
-    import sys
-    import platform
-    from datetime import datetime
+    info = _debug_cache.get("debug")
+    if info is not None:
+        return info
     
     info = {
         "timestamp": datetime.utcnow().isoformat(),
@@ -663,13 +706,12 @@ async def debug_info():
     
     # Check database connection
     try:
-        from app.core.database import async_session_maker
-        from sqlalchemy import text
         async with async_session_maker() as db:
-            await db.execute(text("SELECT 1"))
+            await db.execute(_SELECT_1)
         info["database_connected"] = True
     except Exception as e:
         info["database_connected"] = False
         info["database_error"] = str(e)[:200]
     
+    _debug_cache["debug"] = info
     return info
@@ -0,0 +1,33 @@
+"""Add functional index on tenants.billing_config->>'stripe_customer_id'
+
+Revision ID: a018_tenant_stripe_customer_index
+Revises: 6644b66d24a3
+Create Date: 2026-10-18 00:00:00.000000
+
+Stripe webhooks (subscription canceled, payment failed, subscription
+activated) resolve the tenant by the customer ID stored inside the
+billing_config JSONB. Without an expression index this is a sequential
+scan over tenants on every webhook.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a018_tenant_stripe_customer_index'
+down_revision = '6644b66d24a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tenant_stripe_customer "
+            "ON tenants ((billing_config->>'stripe_customer_id'))"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_tenant_stripe_customer")
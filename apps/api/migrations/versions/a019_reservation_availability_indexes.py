@@ -0,0 +1,52 @@
+"""Add an index for the reservation availability overlap scan
+
+Revision ID: a019_reservation_availability_indexes
+Revises: a018_tenant_stripe_customer_index
+Create Date: 2026-10-18 00:00:00.000000
+
+get_available_tables_for_party filters reservations by tenant, status
+and a reservation_time range on every availability check. A composite
+BTREE index turns that into an index range scan.
+
+reservations is created by init_db's create_all, not by a migration, so
+on a fresh database the table may not exist yet; create_all then builds
+the index from Reservation.__table_args__.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a019_reservation_availability_indexes'
+down_revision = 'a018_tenant_stripe_customer_index'
+branch_labels = None
+depends_on = None
+
+
+def table_exists(table_name: str) -> bool:
+    """Check if a table exists"""
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables WHERE table_name = :name"
+    ), {"name": table_name})
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    if not table_exists('reservations'):
+        return
+    
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reservations_tenant_status_time "
+            "ON reservations (tenant_id, status, reservation_time)"
+        )
+
+
+def downgrade() -> None:
+    if not table_exists('reservations'):
+        return
+    
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_reservations_tenant_status_time")
@@ -44,4 +44,9 @@ echo "🌐 Starting uvicorn server..."
 # Start the server
 # --root-path /api: DigitalOcean strips /api before forwarding; this ensures
 # FastAPI constructs correct redirect URLs (e.g. trailing slash redirects)
-exec uvicorn main:app --host 0.0.0.0 --port ${PORT:-8000} --workers 1 --root-path /api
+# --ws-ping-*: WebSocket keepalive via protocol ping/pong control frames
+# --loop/--http/--ws: pin the C-accelerated uvloop event loop and httptools
+# parser (both in requirements.txt) instead of relying on auto-detection
+exec uvicorn main:app --host 0.0.0.0 --port ${PORT:-8000} --workers 1 --root-path /api \
+    --loop uvloop --http httptools --ws websockets \
+    --ws-ping-interval 20 --ws-ping-timeout 20
@@ -0,0 +1,124 @@
+"""
+RestoNext MX - WebSocket Manager Tests
+Outbox relay, overflow handling and kitchen frame coalescing.
+"""
+
+import asyncio
+import json
+
+from app.core.websocket_manager import OUTBOX_SIZE, ConnectionManager
+
+# Upper bound for waiting on a relay; tests finish as soon as frames arrive
+WAIT_TIMEOUT = 2.0
+
+
+class FakeWebSocket:
+    """Minimal stand-in for starlette's WebSocket"""
+
+    def __init__(self, block_sends: bool = False):
+        self.frames: asyncio.Queue = asyncio.Queue()
+        self.closed = asyncio.Event()
+        self.closed_code = None
+        self._unblock = asyncio.Event()
+        if not block_sends:
+            self._unblock.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        await self._unblock.wait()
+        self.frames.put_nowait(data)
+
+    async def close(self, code: int = 1000):
+        self.closed_code = code
+        self.closed.set()
+
+    async def receive(self, count: int = 1) -> list:
+        """Wait for the next `count` frames sent to this socket"""
+        return [
+            json.loads(await asyncio.wait_for(self.frames.get(), WAIT_TIMEOUT))
+            for _ in range(count)
+        ]
+
+
+class TestOutboxRelay:
+    """Broadcasts are queued per socket and sent in order by its relay"""
+
+    async def test_frames_delivered_in_order(self):
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws, "waiter")
+
+        for i in range(3):
+            await manager.broadcast_to_channel({"event": "test", "n": i}, "waiter")
+
+        assert [m["n"] for m in await ws.receive(3)] == [0, 1, 2]
+        manager.disconnect(ws, "waiter")
+
+    async def test_burst_is_not_dropped_for_fast_client(self):
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws, "waiter")
+
+        # Back-to-back broadcasts never yield to the relay
+        for i in range(40):
+            await manager.broadcast_to_channel({"event": "test", "n": i}, "waiter")
+
+        assert [m["n"] for m in await ws.receive(40)] == list(range(40))
+        assert ws.closed_code is None
+        manager.disconnect(ws, "waiter")
+
+
+class TestOutboxOverflow:
+    """A client that falls OUTBOX_SIZE frames behind is closed, not trimmed"""
+
+    async def test_lagging_socket_is_closed(self):
+        manager = ConnectionManager()
+        slow = FakeWebSocket(block_sends=True)
+        fast = FakeWebSocket()
+        await manager.connect(slow, "waiter")
+        await manager.connect(fast, "waiter")
+
+        # One frame is held by the blocked send, OUTBOX_SIZE fill the queue
+        # and the next one overflows; waiting for the healthy client's copy
+        # of each frame keeps it caught up
+        for i in range(OUTBOX_SIZE + 2):
+            await manager.broadcast_to_channel({"event": "test", "n": i}, "waiter")
+            assert (await fast.receive())[0]["n"] == i
+
+        await asyncio.wait_for(slow.closed.wait(), WAIT_TIMEOUT)
+        assert slow.closed_code == 1013
+        assert manager.get_count("waiter") == 1
+        assert slow not in manager.active_connections["all"]
+        assert fast.closed_code is None
+        manager.disconnect(fast, "waiter")
+
+
+class TestKitchenCoalescing:
+    """Kitchen bursts are sent as one JSON array frame"""
+
+    async def test_burst_coalesced_into_array(self):
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws, "kitchen")
+
+        for i in range(3):
+            await manager.broadcast_to_channel({"event": "kitchen:new_order", "n": i}, "kitchen")
+
+        (batch,) = await ws.receive()
+        assert isinstance(batch, list)
+        assert [m["n"] for m in batch] == [0, 1, 2]
+        assert ws.frames.empty()
+        manager.disconnect(ws, "kitchen")
+
+    async def test_single_message_sent_as_object(self):
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws, "kitchen")
+
+        await manager.broadcast_to_channel({"event": "kitchen:new_order", "n": 0}, "kitchen")
+
+        (message,) = await ws.receive()
+        assert message["n"] == 0
+        manager.disconnect(ws, "kitchen")
@@ -116,59 +116,64 @@ export function useKitchenSocket(options: UseKitchenSocketOptions = {}): UseKitc
         try {
             if (event.data === 'pong') return;
 
-            const rawMessage = JSON.parse(event.data);
-            const rawEvent = rawMessage.event || rawMessage.type || '';
-            const eventType = rawEvent.includes(':') ? rawEvent.split(':').slice(1).join(':') : rawEvent;
-            const payload = rawMessage.payload;
-
-            switch (eventType) {
-                case 'new_order': {
-                    if (payload) {
-                        const ticket = payloadToTicket(payload);
-                        addTicket(ticket);
-                        playNewOrderSound();
-                        triggerVibration([200, 100, 200]);
+            const parsed = JSON.parse(event.data);
+            // The server coalesces bursts of kitchen events into one array frame
+            const messages = Array.isArray(parsed) ? parsed : [parsed];
+
+            for (const rawMessage of messages) {
+                const rawEvent = rawMessage.event || rawMessage.type || '';
+                const eventType = rawEvent.includes(':') ? rawEvent.split(':').slice(1).join(':') : rawEvent;
+                const payload = rawMessage.payload;
+
+                switch (eventType) {
+                    case 'new_order': {
+                        if (payload) {
+                            const ticket = payloadToTicket(payload);
+                            addTicket(ticket);
+                            playNewOrderSound();
+                            triggerVibration([200, 100, 200]);
+                        }
+                        break;
                     }
-                    break;
-                }
 
-                case 'order_update': {
-                    if (payload) {
-                        const ticket = payloadToTicket(payload);
-                        updateTicket(ticket);
+                    case 'order_update': {
+                        if (payload) {
+                            const ticket = payloadToTicket(payload);
+                            updateTicket(ticket);
+                        }
+                        break;
                     }
-                    break;
-                }
 
-                case 'order_all_ready': {
-                    if (payload) {
-                        const ticket = payloadToTicket(payload);
-                        updateTicket(ticket);
-                        playReadySound();
+                    case 'order_all_ready': {
+                        if (payload) {
+                            const ticket = payloadToTicket(payload);
+                            updateTicket(ticket);
+                            playReadySound();
+                        }
+                        break;
                     }
-                    break;
-                }
 
-                case 'order_complete': {
-                    if (payload?.order_id) {
-                        removeTicket(payload.order_id);
+                    case 'order_complete': {
+                        if (payload?.order_id) {
+                            removeTicket(payload.order_id);
+                        }
+                        break;
                     }
-                    break;
-                }
 
-                case 'item_update': {
-                    if (payload?.order_id && payload?.item_id && payload?.status) {
-                        updateItemStatus(
-                            payload.order_id,
-                            payload.item_id,
-                            payload.status as KDSItem["status"]
-                        );
+                    case 'item_update': {
+                        if (payload?.order_id && payload?.item_id && payload?.status) {
+                            updateItemStatus(
+                                payload.order_id,
+                                payload.item_id,
+                                payload.status as KDSItem["status"]
+                            );
+                        }
+                        break;
                     }
-                    break;
-                }
 
-                default:
-                    console.log('Unknown kitchen event:', eventType);
+                    default:
+                        console.log('Unknown kitchen event:', eventType);
+                }
             }
         } catch (error) {
             console.error('Error parsing WebSocket message:', error);